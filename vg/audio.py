@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-import wave
+import io
+import mmap
+import os
+import struct
 from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
 
 @dataclass(frozen=True)
@@ -19,45 +23,65 @@ class WavInfo:
         return self.nframes / float(self.framerate)
 
 
+# fmt/data までのチャンクは通常この範囲に収まる
+_HEADER_PROBE_BYTES = 4096
+
+
 def read_wav_info(path: Path) -> WavInfo:
-    with wave.open(str(path), "rb") as wf:
-        return WavInfo(
-            nchannels=wf.getnchannels(),
-            sampwidth=wf.getsampwidth(),
-            framerate=wf.getframerate(),
-            nframes=wf.getnframes(),
-        )
+    # wave モジュールを使わず、先頭を1回の read で取ってメモリ上で RIFF ヘッダを解析する
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        head = os.read(fd, _HEADER_PROBE_BYTES)
+    finally:
+        os.close(fd)
+    try:
+        info, _ = _parse_wav_header(io.BytesIO(head))
+        return info
+    except ValueError:
+        if len(head) < _HEADER_PROBE_BYTES:
+            raise
+    # 大きな LIST チャンクなどで data が先頭に収まらない場合だけファイルを歩く
+    with open(path, "rb") as f:
+        info, _ = _parse_wav_header(f)
+    return info
 
 
 def concat_wavs(in_paths: list[Path], out_path: Path) -> WavInfo:
     if not in_paths:
         raise ValueError("in_paths is empty")
 
-    infos = [read_wav_info(p) for p in in_paths]
-    first = infos[0]
-    for p, info in zip(in_paths, infos, strict=True):
-        if (info.nchannels, info.sampwidth, info.framerate) != (
-            first.nchannels,
-            first.sampwidth,
-            first.framerate,
-        ):
-            raise ValueError(
-                "WAV parameters mismatch; cannot concat safely. "
-                f"first={first.nchannels}/{first.sampwidth}/{first.framerate}, "
-                f"got={p.name}:{info.nchannels}/{info.sampwidth}/{info.framerate}"
-            )
-
+    # 入力は同一フォーマット前提なので、各ファイルを1回だけ開いてヘッダ検証と data チャンクの連結を同時に行う。
+    # 総フレーム数は最後に分かるので、ヘッダは仮で書いてから書き直す。
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with wave.open(str(out_path), "wb") as out_wf:
-        out_wf.setnchannels(first.nchannels)
-        out_wf.setsampwidth(first.sampwidth)
-        out_wf.setframerate(first.framerate)
-        total_frames = 0
-        for p in in_paths:
-            with wave.open(str(p), "rb") as in_wf:
-                frames = in_wf.readframes(in_wf.getnframes())
-                out_wf.writeframes(frames)
-                total_frames += in_wf.getnframes()
+    first: WavInfo | None = None
+    total_frames = 0
+    try:
+        with open(out_path, "wb", buffering=0) as out:
+            for p in in_paths:
+                with open(p, "rb", buffering=0) as f:
+                    info, offset = _parse_wav_header(f)
+                    if first is None:
+                        first = info
+                        _write_all(out, _pcm_wav_header(first, data_size=0))
+                    elif (info.nchannels, info.sampwidth, info.framerate) != (
+                        first.nchannels,
+                        first.sampwidth,
+                        first.framerate,
+                    ):
+                        raise ValueError(
+                            "WAV parameters mismatch; cannot concat safely. "
+                            f"first={first.nchannels}/{first.sampwidth}/{first.framerate}, "
+                            f"got={p.name}:{info.nchannels}/{info.sampwidth}/{info.framerate}"
+                        )
+                    _copy_range(f, out, offset, info.nframes * info.nchannels * info.sampwidth)
+                    total_frames += info.nframes
+
+            assert first is not None
+            out.seek(0)
+            _write_all(out, _pcm_wav_header(first, data_size=total_frames * first.nchannels * first.sampwidth))
+    except BaseException:
+        out_path.unlink(missing_ok=True)
+        raise
 
     return WavInfo(
         nchannels=first.nchannels,
@@ -66,3 +90,91 @@ def concat_wavs(in_paths: list[Path], out_path: Path) -> WavInfo:
         nframes=total_frames,
     )
 
+
+def _pcm_wav_header(info: WavInfo, *, data_size: int) -> bytes:
+    block_align = info.nchannels * info.sampwidth
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # WAVE_FORMAT_PCM
+        info.nchannels,
+        info.framerate,
+        info.framerate * block_align,
+        block_align,
+        info.sampwidth * 8,
+        b"data",
+        data_size,
+    )
+
+
+def _parse_wav_header(f: BinaryIO) -> tuple[WavInfo, int]:
+    # Walks the RIFF chunk list once; returns (info, offset of the `data` payload).
+    head = f.read(12)
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        raise ValueError("not a RIFF/WAVE file")
+    fmt: tuple[int, int, int] | None = None
+    pos = 12
+    while True:
+        f.seek(pos)
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            raise ValueError("data chunk not found")
+        chunk_id, size = struct.unpack("<4sI", chunk)
+        if chunk_id == b"fmt ":
+            body = f.read(16)
+            if len(body) < 16:
+                raise ValueError("fmt chunk is truncated")
+            format_tag, nchannels, framerate, _, _, bits = struct.unpack("<HHIIHH", body)
+            if format_tag not in (0x0001, 0xFFFE):  # PCM / WAVE_FORMAT_EXTENSIBLE
+                raise ValueError(f"unsupported WAV format tag: {format_tag:#06x}")
+            fmt = (nchannels, (bits + 7) // 8, framerate)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("fmt chunk not found before data")
+            nchannels, sampwidth, framerate = fmt
+            if nchannels <= 0 or sampwidth <= 0:
+                raise ValueError("invalid fmt chunk")
+            info = WavInfo(
+                nchannels=nchannels,
+                sampwidth=sampwidth,
+                framerate=framerate,
+                nframes=size // (nchannels * sampwidth),
+            )
+            return info, pos + 8
+        # チャンクは2バイト境界に揃えられる
+        pos += 8 + size + (size & 1)
+
+
+def _copy_range(src: BinaryIO, dst: BinaryIO, offset: int, length: int) -> None:
+    if length <= 0:
+        return
+    done = 0
+    if hasattr(os, "sendfile"):
+        # Linux はファイル間の sendfile が使える（macOS/Windows は下の mmap にフォールバック）
+        try:
+            while done < length:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset + done, length - done)
+                if sent == 0:
+                    raise ValueError("unexpected end of WAV data")
+                done += sent
+            return
+        except OSError:
+            if done:
+                raise
+
+    with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < offset + length:
+            raise ValueError("unexpected end of WAV data")
+        with memoryview(mm) as mv:
+            _write_all(dst, mv[offset : offset + length])
+
+
+def _write_all(dst: BinaryIO, data: bytes | memoryview) -> None:
+    view = memoryview(data)
+    while view:
+        n = dst.write(view)
+        view = view[n:]
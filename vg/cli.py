@@ -2,19 +2,7 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-
-from .init_project import init_project
-from .images import fetch_images
-from .import_url import import_url
-from .import_file import import_file
-from .dialog import build_dialog_segments
-from .speakers import assign_speakers
-from .render import render_long
-from .script import build_script_segments
-from .shorts import render_shorts
-from .timeline import build_timeline
-from .tts import synthesize_tts
-from .visuals import assign_visuals
+from typing import Callable
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -42,7 +30,13 @@ def main(argv: list[str] | None = None) -> int:
     p_render.add_argument("project_dir", type=Path)
     p_render.add_argument("--out", default=None, help="出力mp4 (デフォルト: export/master_long.mp4)")
     p_render.add_argument("--fontfile", default=None, help="drawtext用フォントファイルへのパス（任意）")
-    p_render.add_argument("--force", action="store_true", help="中間生成物があっても再生成")
+    p_render.add_argument("--force", action="store_true", help="既存のセグメント mp4 があっても再生成（セグメントごとに書き出すときのみ。1回でまとめる方式は常に全体を書き出す）")
+    # --pipelined はセグメントごとの mp4 を連結する方式なので、--legacy-concat とは併用できない
+    render_mode = p_render.add_mutually_exclusive_group()
+    render_mode.add_argument("--legacy-concat", action="store_true", help="セグメントごとに mp4 を作ってから連結（従来方式）")
+    render_mode.add_argument("--pipelined", action="store_true", help="TTS と並行してセグメントを書き出し、timeline まで通しで作る")
+    p_render.add_argument("--base-url", default=None, help="--pipelined の TTS 用 (project.jsonを上書き)")
+    p_render.add_argument("--speaker", default=None, type=int, help="--pipelined の TTS 用 speaker id (project.jsonを上書き)")
 
     p_shorts = sub.add_parser("shorts", help="Shorts(9:16)を書き出し")
     p_shorts.add_argument("project_dir", type=Path)
@@ -68,6 +62,8 @@ def main(argv: list[str] | None = None) -> int:
     p_import.add_argument("--force", action="store_true", help="既存 article.md があっても上書き")
     p_import.add_argument("--fetch-images", action="store_true", help="記事内画像をダウンロード（assets/images/article）")
     p_import.add_argument("--rewrite-images", action="store_true", help="Markdownの画像URLをローカル参照に書き換え")
+    p_import.add_argument("--no-html", action="store_true", help="取得した生HTML（source/article.html）を保存しない")
+    p_import.add_argument("--no-cache", action="store_true", help="Markdown変換結果のキャッシュ（~/.cache/vg/html2md）を使わない")
 
     p_import_file = sub.add_parser("import-file", help="txt/docx/pptx/md から記事Markdownを作って案件を作成")
     p_import_file.add_argument("path", type=Path)
@@ -93,76 +89,166 @@ def main(argv: list[str] | None = None) -> int:
 
     args = parser.parse_args(argv)
 
-    if args.cmd == "init":
-        init_project(args.slug)
-        return 0
-    if args.cmd == "script":
-        build_script_segments(args.project_dir, source_relpath=args.source)
-        return 0
-    if args.cmd == "tts":
-        synthesize_tts(
-            args.project_dir,
-            base_url=args.base_url,
-            speaker=args.speaker,
-            force=args.force,
-        )
-        return 0
-    if args.cmd == "timeline":
-        build_timeline(args.project_dir, concat_wav=args.concat_wav)
-        return 0
-    if args.cmd == "render":
-        render_long(args.project_dir, out=args.out, fontfile=args.fontfile, force=args.force)
-        return 0
-    if args.cmd == "shorts":
-        render_shorts(
+    handler = _DISPATCH.get(args.cmd)
+    if handler is None:
+        parser.error("unknown command")
+        return 2
+    return handler(args)
+
+
+# サブコマンドのモジュールは実行時にだけ import する（CLI の起動を軽くするため）
+
+
+def _cmd_init(args: argparse.Namespace) -> int:
+    from .init_project import init_project
+
+    init_project(args.slug)
+    return 0
+
+
+def _cmd_script(args: argparse.Namespace) -> int:
+    from .script import build_script_segments
+
+    build_script_segments(args.project_dir, source_relpath=args.source)
+    return 0
+
+
+def _cmd_tts(args: argparse.Namespace) -> int:
+    from .tts import synthesize_tts
+
+    synthesize_tts(
+        args.project_dir,
+        base_url=args.base_url,
+        speaker=args.speaker,
+        force=args.force,
+    )
+    return 0
+
+
+def _cmd_timeline(args: argparse.Namespace) -> int:
+    from .timeline import build_timeline
+
+    build_timeline(args.project_dir, concat_wav=args.concat_wav)
+    return 0
+
+
+def _cmd_render(args: argparse.Namespace) -> int:
+    if args.pipelined:
+        from .pipeline import render_pipelined
+
+        render_pipelined(
             args.project_dir,
-            in_path=args.in_path,
-            out_dir=args.out_dir,
-            one_id=args.one_id,
-            title=args.title,
-            start=args.start,
-            end=args.end,
-            segments=args.segments,
+            out=args.out,
             fontfile=args.fontfile,
             force=args.force,
+            base_url=args.base_url,
+            speaker=args.speaker,
         )
         return 0
-    if args.cmd == "fetch-images":
-        fetch_images(args.project_dir, md_relpath=args.md, out_relpath=args.out_dir, rewrite=args.rewrite)
-        return 0
-    if args.cmd == "import-url":
-        import_url(
-            args.url,
-            slug=args.slug,
-            force=args.force,
-            fetch_article_images=args.fetch_images,
-            rewrite_images=args.rewrite_images,
-        )
-        return 0
-    if args.cmd == "import-file":
-        import_file(
-            args.path,
-            slug=args.slug,
-            title=args.title,
-            force=args.force,
-            extract_images=not args.no_extract_images,
-        )
-        return 0
-    if args.cmd == "dialog":
-        build_dialog_segments(args.project_dir, source_relpath=args.source, force=args.force)
-        return 0
-    if args.cmd == "assign-speakers":
-        speaker_ids = [int(x.strip()) for x in args.speakers.split(",") if x.strip()]
-        assign_speakers(
-            args.project_dir,
-            speakers=speaker_ids,
-            mode=args.mode,
-            only_missing=not args.all,
-        )
-        return 0
-    if args.cmd == "visuals":
-        assign_visuals(args.project_dir, force=args.force)
-        return 0
 
-    parser.error("unknown command")
-    return 2
+    from .render import render_long
+
+    render_long(
+        args.project_dir,
+        out=args.out,
+        fontfile=args.fontfile,
+        force=args.force,
+        legacy_concat=args.legacy_concat,
+    )
+    return 0
+
+
+def _cmd_shorts(args: argparse.Namespace) -> int:
+    from .shorts import render_shorts
+
+    render_shorts(
+        args.project_dir,
+        in_path=args.in_path,
+        out_dir=args.out_dir,
+        one_id=args.one_id,
+        title=args.title,
+        start=args.start,
+        end=args.end,
+        segments=args.segments,
+        fontfile=args.fontfile,
+        force=args.force,
+    )
+    return 0
+
+
+def _cmd_fetch_images(args: argparse.Namespace) -> int:
+    from .images import fetch_images
+
+    fetch_images(args.project_dir, md_relpath=args.md, out_relpath=args.out_dir, rewrite=args.rewrite)
+    return 0
+
+
+def _cmd_import_url(args: argparse.Namespace) -> int:
+    from .import_url import import_url
+
+    import_url(
+        args.url,
+        slug=args.slug,
+        force=args.force,
+        fetch_article_images=args.fetch_images,
+        rewrite_images=args.rewrite_images,
+        save_html=not args.no_html,
+        use_cache=not args.no_cache,
+    )
+    return 0
+
+
+def _cmd_import_file(args: argparse.Namespace) -> int:
+    from .import_file import import_file
+
+    import_file(
+        args.path,
+        slug=args.slug,
+        title=args.title,
+        force=args.force,
+        extract_images=not args.no_extract_images,
+    )
+    return 0
+
+
+def _cmd_dialog(args: argparse.Namespace) -> int:
+    from .dialog import build_dialog_segments
+
+    build_dialog_segments(args.project_dir, source_relpath=args.source, force=args.force)
+    return 0
+
+
+def _cmd_assign_speakers(args: argparse.Namespace) -> int:
+    from .speakers import assign_speakers
+
+    speaker_ids = [int(x.strip()) for x in args.speakers.split(",") if x.strip()]
+    assign_speakers(
+        args.project_dir,
+        speakers=speaker_ids,
+        mode=args.mode,
+        only_missing=not args.all,
+    )
+    return 0
+
+
+def _cmd_visuals(args: argparse.Namespace) -> int:
+    from .visuals import assign_visuals
+
+    assign_visuals(args.project_dir, force=args.force)
+    return 0
+
+
+_DISPATCH: dict[str, Callable[[argparse.Namespace], int]] = {
+    "init": _cmd_init,
+    "script": _cmd_script,
+    "tts": _cmd_tts,
+    "timeline": _cmd_timeline,
+    "render": _cmd_render,
+    "shorts": _cmd_shorts,
+    "fetch-images": _cmd_fetch_images,
+    "import-url": _cmd_import_url,
+    "import-file": _cmd_import_file,
+    "dialog": _cmd_dialog,
+    "assign-speakers": _cmd_assign_speakers,
+    "visuals": _cmd_visuals,
+}
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+from .jsonio import write_json
 from .project import load_project
 
 
@@ -18,6 +20,10 @@ class DialogLine:
 
 _heading_re = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
 _dialog_re = re.compile(r"^([A-Za-z][A-Za-z0-9_-]{0,15})(?:\((\d{1,5})\))?\s*:\s*(.+?)\s*$")
+_slug_ws_re = re.compile(r"\s+")
+_slug_drop_re = re.compile(r"[^0-9a-zA-Z_ぁ-んァ-ヶ一-龠ー]+")
+# ASCII のみの場合に _slug_drop_re と同じ文字を落とす変換表
+_slug_ascii_drop = str.maketrans("", "", "".join(chr(c) for c in range(128) if not (chr(c).isalnum() or c == ord("_"))))
 
 
 def build_dialog_segments(project_dir: Path, *, source_relpath: str = "script/dialog.md", force: bool = False) -> None:
@@ -47,10 +53,10 @@ def build_dialog_segments(project_dir: Path, *, source_relpath: str = "script/di
     seg_dir.mkdir(parents=True, exist_ok=True)
 
     index: list[dict] = []
+    writes: list[tuple[Path, bytes]] = []
     for idx, line in enumerate(lines, start=1):
         seg_id = f"{idx:04d}_{_slugify(line.speaker_key)}"
-        txt_path = seg_dir / f"{seg_id}.txt"
-        txt_path.write_text(line.text.strip() + "\n", encoding="utf-8")
+        writes.append((seg_dir / f"{seg_id}.txt", (line.text.strip() + "\n").encode("utf-8")))
 
         item: dict = {
             "id": seg_id,
@@ -62,10 +68,20 @@ def build_dialog_segments(project_dir: Path, *, source_relpath: str = "script/di
             item["speaker"] = speaker
         index.append(item)
 
-    (project.path("script") / "segments.json").write_text(
-        json.dumps(index, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+    _write_files(writes)
+    write_json(project.path("script", "segments.json"), index)
+
+
+def _write_files(writes: list[tuple[Path, bytes]]) -> None:
+    # 長い台本では数千ファイルになるので、open/write/close の待ちをスレッドで重ねる
+    if len(writes) <= 1:
+        for path, data in writes:
+            path.write_bytes(data)
+        return
+    workers = min(32, (os.cpu_count() or 1) * 4, len(writes))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for _ in ex.map(lambda w: w[0].write_bytes(w[1]), writes):
+            pass
 
 
 def _parse_dialog(markdown: str) -> list[DialogLine]:
@@ -75,8 +91,7 @@ def _parse_dialog(markdown: str) -> list[DialogLine]:
     in_frontmatter = False
     frontmatter_done = False
 
-    for raw in markdown.splitlines():
-        line = raw.rstrip("\n")
+    for line in markdown.splitlines():
 
         if not frontmatter_done and line.strip() == "---":
             in_frontmatter = not in_frontmatter
@@ -131,6 +146,10 @@ def _load_speaker_map(project) -> dict[str, int]:
 
 def _slugify(s: str) -> str:
     s = s.strip().lower()
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^0-9a-zA-Z_ぁ-んァ-ヶ一-龠ー]+", "", s)
+    if s.isascii():
+        # 話者キーはほぼ ASCII なので、正規表現を使わず split/translate で処理する
+        s = "_".join(s.split()).translate(_slug_ascii_drop)
+    else:
+        s = _slug_ws_re.sub("_", s)
+        s = _slug_drop_re.sub("", s)
     return s[:24].strip("_") or "spk"
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import platform
+import re
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_path() -> str | None:
+    """Returns the ffmpeg executable found on PATH (looked up once per process)."""
+    return shutil.which("ffmpeg")
+
+
+def run_ffmpeg(args: list[str], *, tail_lines: int = 40) -> tuple[int, str]:
+    """
+    Runs ffmpeg and returns (returncode, last `tail_lines` lines of stderr).
+    stderr is consumed line by line into a ring buffer, so long encodes don't keep
+    their whole log in memory.
+    """
+    tail: deque[str] = deque(maxlen=tail_lines)
+    with subprocess.Popen(
+        args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    ) as proc:
+        assert proc.stderr is not None
+        # 進捗行は \r 区切りだが、テキストモードの改行変換で1行ずつに分かれる
+        for line in proc.stderr:
+            tail.append(line.rstrip("\n"))
+        returncode = proc.wait()
+    return returncode, "\n".join(tail)
+
+
+@dataclass(frozen=True)
+class FFmpegCaps:
+    filters: frozenset[str]
+    encoders: frozenset[str]
+    formats: frozenset[str]
+
+
+@lru_cache(maxsize=1)
+def probe_ffmpeg() -> FFmpegCaps:
+    """
+    Lists ffmpeg's filters, encoders and formats (once per process; empty sets without ffmpeg).
+    """
+    # ffmpeg は -filters 等を1つ表示した時点で終了するので、1回の起動では3つを取れない。
+    # 3つの問い合わせを同時に走らせ、待ち時間を1回分にする
+    flags = ("-filters", "-encoders", "-formats")
+    with ThreadPoolExecutor(max_workers=len(flags)) as ex:
+        filters, encoders, formats = ex.map(_ffmpeg_list, flags)
+    return FFmpegCaps(filters=filters, encoders=encoders, formats=formats)
+
+
+def ffmpeg_has_filter(name: str) -> bool:
+    return name in probe_ffmpeg().filters
+
+
+def ffmpeg_has_encoder(name: str) -> bool:
+    return name in probe_ffmpeg().encoders
+
+
+def _ffmpeg_list(flag: str) -> frozenset[str]:
+    try:
+        proc = subprocess.run(
+            ["ffmpeg", "-hide_banner", flag],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        return frozenset()
+
+    # 各行は " TSC gblur  V->V  説明" / " V....D libx264  説明" / " DE mov,mp4  説明" の形式（フラグ・名前・説明）。
+    # -encoders と -formats は凡例の後の " ---" 以降、-filters は "->" を含む行が一覧本体
+    names: set[str] = set()
+    started = flag == "-filters"
+    for line in (proc.stdout or "").splitlines():
+        if not started:
+            started = line.strip().startswith("---")
+            continue
+        parts = line.split(None, 2)
+        if len(parts) < 2 or (flag == "-filters" and "->" not in line):
+            continue
+        names.update(parts[1].split(","))
+    return frozenset(names)
+
+
+_ffmpeg_version_re = re.compile(r"^ffmpeg version n?(\d+)\.(\d+)")
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_version() -> tuple[int, int] | None:
+    """
+    Returns ffmpeg's (major, minor) release version, or None when ffmpeg is missing or
+    reports a non-release build (e.g. a git snapshot "N-12345-g...").
+    """
+    try:
+        proc = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=False,
+        )
+    except FileNotFoundError:
+        return None
+    m = _ffmpeg_version_re.match(proc.stdout or "")
+    if m is None:
+        return None
+    return int(m.group(1)), int(m.group(2))
+
+
+def filter_complex_file_args(path: Path) -> list[str]:
+    """
+    Returns the options that load a -filter_complex graph from `path`.
+    ffmpeg 7.0+ reads option values from files with `-/filter_complex` and warns on the
+    deprecated `-filter_complex_script`; older (or unidentified) builds get the latter.
+    """
+    version = ffmpeg_version()
+    if version is not None and version >= (7, 0):
+        return ["-/filter_complex", str(path)]
+    return ["-filter_complex_script", str(path)]
+
+
+# project.json の video.*.encoder に書けるエンコーダと、それぞれの画質指定（libx264 の crf 18 と同程度が目安）
+_VIDEO_ENCODER_ARGS: dict[str, tuple[str, ...]] = {
+    "libx264": ("-preset", "veryfast", "-crf", "18"),
+    "h264_videotoolbox": ("-b:v", "6M"),
+    "h264_nvenc": ("-preset", "p4", "-rc", "vbr", "-cq", "20", "-b:v", "0"),
+}
+
+
+def resolve_video_encoder(name: str | None) -> str:
+    """
+    Resolves a `video.*.encoder` setting to an ffmpeg encoder name.
+
+    - unset / "libx264": CPU encoding (default)
+    - "auto": h264_videotoolbox on macOS, h264_nvenc on Linux when ffmpeg has it, else libx264
+    - "h264_videotoolbox" / "h264_nvenc": that hardware encoder (must be available in ffmpeg)
+    """
+    if not name or name == "libx264":
+        return "libx264"
+    if name == "auto":
+        system = platform.system()
+        if system == "Darwin" and ffmpeg_has_encoder("h264_videotoolbox"):
+            return "h264_videotoolbox"
+        if system == "Linux" and ffmpeg_has_encoder("h264_nvenc"):
+            return "h264_nvenc"
+        return "libx264"
+    if name not in _VIDEO_ENCODER_ARGS:
+        raise ValueError(f"unsupported video encoder: {name} (choose from: auto, {', '.join(_VIDEO_ENCODER_ARGS)})")
+    if not ffmpeg_has_encoder(name):
+        raise RuntimeError(f"ffmpeg にエンコーダ {name} がありません。encoder を auto か libx264 にしてください。")
+    return name
+
+
+def video_codec_args(encoder: str) -> list[str]:
+    """Returns `-c:v <encoder>` followed by that encoder's quality options."""
+    return ["-c:v", encoder, *_VIDEO_ENCODER_ARGS[encoder]]
+
+
+@dataclass(frozen=True)
+class VideoStreamInfo:
+    width: int
+    height: int
+    fps: float
+    codec: str
+    audio_codecs: tuple[str, ...]
+
+
+def probe_video_stream(path: Path) -> VideoStreamInfo | None:
+    """
+    Returns the first video stream's size, frame rate and codec (plus the codecs of all audio
+    streams) via ffprobe, or None when ffprobe is unavailable or the file has no readable
+    video stream. Cached per (path, mtime, size).
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return _probe_video_stream(str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _probe_video_stream(path: str, mtime_ns: int, size: int) -> VideoStreamInfo | None:
+    if shutil.which("ffprobe") is None:
+        return None
+    proc = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "stream=codec_type,codec_name,width,height,r_frame_rate",
+            "-of",
+            "json",
+            path,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        return None
+    try:
+        streams = json.loads(proc.stdout or "{}").get("streams") or []
+        stream = [st for st in streams if st.get("codec_type") == "video"][0]
+        num, _, den = str(stream.get("r_frame_rate", "0/1")).partition("/")
+        fps = float(num) / float(den or 1)
+        return VideoStreamInfo(
+            width=int(stream["width"]),
+            height=int(stream["height"]),
+            fps=fps,
+            codec=str(stream.get("codec_name") or ""),
+            audio_codecs=tuple(str(st.get("codec_name") or "") for st in streams if st.get("codec_type") == "audio"),
+        )
+    except (IndexError, KeyError, TypeError, ValueError, ZeroDivisionError):
+        return None
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-import json
+import functools
 import mimetypes
 import os
+import posixpath
 import re
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from html import unescape
 from html.parser import HTMLParser
@@ -13,9 +17,19 @@ from typing import Iterable
 from urllib.parse import urljoin, urlparse
 from urllib.request import Request, urlopen
 
+from .jsonio import write_json
 
-_md_image_re = re.compile(r"!\[[^\]]*\]\(([^)]+)\)")
-_html_img_re = re.compile(r"""<img[^>]+(?:src|data-src)=["']([^"']+)["'][^>]*>""", re.IGNORECASE)
+
+# Markdown の ![](...) と埋め込み HTML の <img src=...> を1回の走査で拾う
+_any_image_re = re.compile(
+    r"!\[[^\]]*\]\((?P<md>[^)]+)\)"
+    r"""|<img[^>]+(?:src|data-src)=["'](?P<html>[^"']+)["'][^>]*>""",
+    re.IGNORECASE,
+)
+_safe_stem_re = re.compile(r"[^0-9A-Za-zぁ-んァ-ヶ一-龠ー_-]+")
+
+_DOWNLOAD_WORKERS = 8
+_PER_HOST_INTERVAL_SEC = 0.1
 
 
 @dataclass(frozen=True)
@@ -25,6 +39,14 @@ class DownloadedImage:
     bytes: int
 
 
+@dataclass(frozen=True)
+class _ImageRef:
+    start: int
+    end: int
+    url: str
+    is_html: bool
+
+
 def fetch_images(project_dir: Path, *, md_relpath: str, out_relpath: str, rewrite: bool) -> list[DownloadedImage]:
     project_dir = project_dir.resolve()
     md_path = project_dir / md_relpath
@@ -36,46 +58,55 @@ def fetch_images(project_dir: Path, *, md_relpath: str, out_relpath: str, rewrit
 
     md = md_path.read_text(encoding="utf-8")
     base_url = _extract_source_url_from_markdown(md)
-    urls = list(_extract_image_urls_from_markdown(md, base_url=base_url))
+    refs = _scan_image_refs(md)
+    urls = list(_extract_image_urls_from_markdown(refs, base_url=base_url))
     # Fallback: some pages (e.g. note.com) omit <img> in generated Markdown.
     html_path = project_dir / "source" / "article.html"
     if html_path.exists():
         html = html_path.read_text(encoding="utf-8", errors="replace")
         urls.extend(_extract_image_urls_from_html(html, base_url=base_url))
-        urls = _dedupe_preserve_order_by(
-            urls,
-            key=lambda u: (urlparse(u).scheme, urlparse(u).netloc, urlparse(u).path),
-        )
+        urls = _dedupe_preserve_order_by(urls, key=_url_identity)
     if not urls:
         return []
 
     downloaded: list[DownloadedImage] = []
     mapping: dict[str, str] = {}
 
-    for url in urls:
-        local_path = _suggest_path(out_dir, url)
-        data = _download(url)
-        local_path.write_bytes(data)
-        rel = local_path.relative_to(project_dir).as_posix()
-        downloaded.append(DownloadedImage(original_url=url, local_relpath=rel, bytes=len(data)))
-        mapping[url] = rel
-        time.sleep(0.1)
-
-    (out_dir / "images.json").write_text(
-        json.dumps(
-            {
-                "downloaded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
-                "items": [{"url": d.original_url, "path": d.local_relpath, "bytes": d.bytes} for d in downloaded],
-            },
-            ensure_ascii=False,
-            indent=2,
-        )
-        + "\n",
-        encoding="utf-8",
+    # ダウンロードは並列で一時ファイルへ直接書き出し、確定（採番・rename）は入力順にメインスレッドで行う
+    throttle = _HostThrottle(_PER_HOST_INTERVAL_SEC)
+    part_paths = [out_dir / f".download_{i:04d}.part" for i in range(len(urls))]
+    taken_names = {entry.name for entry in os.scandir(out_dir)}
+    taken_folded = {name.casefold() for name in taken_names}
+    try:
+        with ThreadPoolExecutor(max_workers=_DOWNLOAD_WORKERS) as ex:
+            futures = [ex.submit(_download_to, u, p, throttle=throttle) for u, p in zip(urls, part_paths)]
+            try:
+                for url, part_path, fut in zip(urls, part_paths, futures):
+                    size = fut.result()
+                    local_path = _suggest_path(out_dir, url, taken=taken_names, taken_folded=taken_folded)
+                    os.replace(part_path, local_path)
+                    rel = local_path.relative_to(project_dir).as_posix()
+                    downloaded.append(DownloadedImage(original_url=url, local_relpath=rel, bytes=size))
+                    mapping[url] = rel
+            except BaseException:
+                # 最初の失敗で止める（まだ始まっていないダウンロードは取り消す）
+                for fut in futures:
+                    fut.cancel()
+                raise
+    finally:
+        for part_path in part_paths:
+            part_path.unlink(missing_ok=True)
+
+    write_json(
+        out_dir / "images.json",
+        {
+            "downloaded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "items": [{"url": d.original_url, "path": d.local_relpath, "bytes": d.bytes} for d in downloaded],
+        },
     )
 
     if rewrite:
-        md2 = _rewrite_markdown_images(md, project_dir=project_dir, md_path=md_path, url_to_rel=mapping)
+        md2 = _rewrite_markdown_images(md, refs, project_dir=project_dir, md_path=md_path, url_to_rel=mapping)
         if md2 != md:
             md_path.write_text(md2, encoding="utf-8")
 
@@ -84,46 +115,80 @@ def fetch_images(project_dir: Path, *, md_relpath: str, out_relpath: str, rewrit
 
 def _extract_source_url_from_markdown(markdown: str) -> str | None:
     # Read only from top YAML-ish block to avoid false positives.
-    lines = markdown.splitlines()
-    if not lines or lines[0].strip() != "---":
-        return None
-    for line in lines[1:60]:
-        if line.strip() == "---":
+    # 先頭60行だけを str.find で切り出す（本文全体は splitlines しない）
+    pos, n = 0, len(markdown)
+    for lineno in range(60):
+        end = markdown.find("\n", pos)
+        if end == -1:
+            end = n
+        line = markdown[pos:end].rstrip("\r")
+        if lineno == 0:
+            if line.strip() != "---":
+                return None
+        elif line.strip() == "---":
             break
-        if line.startswith("source_url:"):
+        elif line.startswith("source_url:"):
             return line.split(":", 1)[1].strip() or None
+        if end >= n:
+            break
+        pos = end + 1
     return None
 
 
-def _extract_image_urls_from_markdown(markdown: str, *, base_url: str | None) -> Iterable[str]:
-    for m in _md_image_re.finditer(markdown):
-        url = m.group(1).strip()
-        url = _absolutize(url, base_url)
+def _scan_image_refs(markdown: str) -> list[_ImageRef]:
+    refs: list[_ImageRef] = []
+    for m in _any_image_re.finditer(markdown):
+        md_url = m.group("md")
+        if md_url is not None:
+            refs.append(_ImageRef(start=m.start(), end=m.end(), url=md_url.strip(), is_html=False))
+        else:
+            refs.append(_ImageRef(start=m.start(), end=m.end(), url=m.group("html").strip(), is_html=True))
+    return refs
+
+
+def _extract_image_urls_from_markdown(refs: list[_ImageRef], *, base_url: str | None) -> Iterable[str]:
+    for ref in refs:
+        if ref.is_html:
+            continue
+        url = _absolutize(ref.url, base_url)
         if url:
             yield url
 
 
 def _extract_image_urls_from_html(html: str, *, base_url: str | None) -> list[str]:
-    parser = _ImageUrlHTMLParser(base_url=base_url)
-    parser.feed(html)
-    parser.close()
-    return parser.urls
+    try:
+        from selectolax.lexbor import LexborHTMLParser  # type: ignore[import-not-found]
+    except ImportError:
+        # selectolax は任意依存。無ければ標準ライブラリのパーサで処理する。
+        parser = _ImageUrlHTMLParser(base_url=base_url)
+        parser.feed(html)
+        parser.close()
+        return parser.urls
+
+    urls: list[str] = []
+    tree = LexborHTMLParser(html)
+    for node in tree.css("img, source, meta, link"):
+        a = {k.lower(): (v or "") for k, v in node.attributes.items()}
+        urls.extend(_image_urls_from_tag(node.tag, a, base_url=base_url))
+    return urls
 
 
 def _dedupe_preserve_order(items: list[str]) -> list[str]:
-    return _dedupe_preserve_order_by(items, key=lambda x: x)
+    return list(dict.fromkeys(items))
 
 
 def _dedupe_preserve_order_by(items: list[str], *, key) -> list[str]:
-    seen: set[str] = set()
-    out: list[str] = []
+    # dict は挿入順を保つので、キーごとに最初の要素だけが残る
+    first_by_key: dict = {}
     for x in items:
-        k = key(x)
-        if k in seen:
-            continue
-        seen.add(k)
-        out.append(x)
-    return out
+        first_by_key.setdefault(key(x), x)
+    return list(first_by_key.values())
+
+
+def _url_identity(url: str) -> tuple[str, str, str]:
+    # クエリ違い（リサイズ指定など）は同一画像として扱う
+    p = urlparse(url)
+    return p.scheme, p.netloc, p.path
 
 
 def _absolutize(url: str, base_url: str | None) -> str | None:
@@ -151,12 +216,22 @@ def _parse_srcset(srcset: str) -> list[str]:
 _IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".avif", ".svg"}
 
 
+def _url_path_splitext(url_path: str) -> tuple[str, str]:
+    # Path(url_path).stem / .suffix と同じ結果を、Path を作らずに得る
+    name = posixpath.basename(url_path.rstrip("/"))
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ""
+
+
+@functools.lru_cache(maxsize=4096)
 def _looks_like_image_url(url: str) -> bool:
     try:
         p = urlparse(url)
     except Exception:
         return False
-    suffix = Path(p.path).suffix.lower()
+    suffix = _url_path_splitext(p.path)[1].lower()
     if suffix in _IMAGE_EXTS:
         return True
     # Some CDNs omit extensions but are clearly image endpoints.
@@ -166,6 +241,45 @@ def _looks_like_image_url(url: str) -> bool:
     return False
 
 
+def _image_urls_from_tag(tag: str, a: dict[str, str], *, base_url: str | None) -> list[str]:
+    candidates: list[str | None] = []
+
+    if tag == "img":
+        candidates.append(a.get("src"))
+        candidates.append(a.get("data-src"))
+        candidates.append(a.get("data-original"))
+        candidates.append(a.get("data-lazy-src"))
+        candidates.extend(_parse_srcset(a.get("srcset") or ""))
+        candidates.extend(_parse_srcset(a.get("data-srcset") or ""))
+
+    if tag == "source":
+        candidates.extend(_parse_srcset(a.get("srcset") or ""))
+
+    if tag == "meta":
+        key = (a.get("property") or a.get("name") or "").lower()
+        if key in {"og:image", "twitter:image", "twitter:image:src"}:
+            candidates.append(a.get("content"))
+
+    if tag == "link":
+        rel = (a.get("rel") or "").lower()
+        if rel == "image_src":
+            candidates.append(a.get("href"))
+        if rel == "preload" and (a.get("as") or "").lower() == "image":
+            candidates.append(a.get("href"))
+
+    out: list[str] = []
+    for url in candidates:
+        if not url:
+            continue
+        abs_url = _absolutize(url, base_url)
+        if not abs_url:
+            continue
+        if not _looks_like_image_url(abs_url):
+            continue
+        out.append(abs_url)
+    return out
+
+
 class _ImageUrlHTMLParser(HTMLParser):
     def __init__(self, *, base_url: str | None) -> None:
         super().__init__(convert_charrefs=True)
@@ -173,48 +287,30 @@ class _ImageUrlHTMLParser(HTMLParser):
         self.urls: list[str] = []
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-        tag = tag.lower()
         a = {k.lower(): (v or "") for k, v in attrs}
+        self.urls.extend(_image_urls_from_tag(tag.lower(), a, base_url=self._base_url))
 
-        if tag == "img":
-            self._add_one(a.get("src"))
-            self._add_one(a.get("data-src"))
-            self._add_one(a.get("data-original"))
-            self._add_one(a.get("data-lazy-src"))
-
-            for u in _parse_srcset(a.get("srcset") or ""):
-                self._add_one(u)
-            for u in _parse_srcset(a.get("data-srcset") or ""):
-                self._add_one(u)
-
-        if tag == "source":
-            for u in _parse_srcset(a.get("srcset") or ""):
-                self._add_one(u)
-
-        if tag == "meta":
-            key = (a.get("property") or a.get("name") or "").lower()
-            if key in {"og:image", "twitter:image", "twitter:image:src"}:
-                self._add_one(a.get("content"))
-
-        if tag == "link":
-            rel = (a.get("rel") or "").lower()
-            if rel == "image_src":
-                self._add_one(a.get("href"))
-            if rel == "preload" and (a.get("as") or "").lower() == "image":
-                self._add_one(a.get("href"))
-
-    def _add_one(self, url: str | None) -> None:
-        if not url:
-            return
-        abs_url = _absolutize(url, self._base_url)
-        if not abs_url:
-            return
-        if not _looks_like_image_url(abs_url):
-            return
-        self.urls.append(abs_url)
 
+class _HostThrottle:
+    # 同一ホストへのリクエスト間隔だけを空ける（別ホストは待たない）
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next_at: dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next_at.get(host, now))
+            self._next_at[host] = at + self._interval
+        if at > now:
+            time.sleep(at - now)
 
-def _download(url: str) -> bytes:
+
+def _download_to(url: str, path: Path, *, throttle: _HostThrottle | None = None) -> int:
+    if throttle is not None:
+        throttle.wait(url)
     req = Request(
         url,
         headers={
@@ -223,57 +319,82 @@ def _download(url: str) -> bytes:
         },
         method="GET",
     )
-    with urlopen(req) as resp:
-        return resp.read()
+    with urlopen(req) as resp, open(path, "wb") as fp:
+        shutil.copyfileobj(resp, fp, 1 << 16)
+        return fp.tell()
 
 
-def _suggest_path(out_dir: Path, url: str) -> Path:
+def _suggest_path(out_dir: Path, url: str, *, taken: set[str], taken_folded: set[str]) -> Path:
+    # taken: out_dir 内で使用済みのファイル名（taken_folded はその casefold）。呼び出し側で1回だけ列挙し、採番ごとに追加する。
     parsed = urlparse(url)
-    name = Path(parsed.path).name
-    if not name:
-        name = "image"
 
     # クエリは無視して拡張子を保つ
-    stem = Path(name).stem
-    suffix = Path(name).suffix
+    stem, suffix = _url_path_splitext(parsed.path)
+    if not stem:
+        stem = "image"
     if not suffix:
         guessed, _ = mimetypes.guess_type(parsed.path)
         suffix = mimetypes.guess_extension(guessed or "") or ".img"
 
-    safe_stem = re.sub(r"[^0-9A-Za-zぁ-んァ-ヶ一-龠ー_-]+", "_", stem).strip("_") or "image"
-    base = out_dir / f"{safe_stem}{suffix}"
-
-    if not base.exists():
-        return base
+    safe_stem = _safe_stem_re.sub("_", stem).strip("_") or "image"
+    cand_name = f"{safe_stem}{suffix}"
+    if not _name_taken(out_dir, cand_name, taken, taken_folded):
+        _take(cand_name, taken, taken_folded)
+        return out_dir / cand_name
 
     # 重複時は連番
     for i in range(2, 1000):
-        cand = out_dir / f"{safe_stem}_{i}{suffix}"
-        if not cand.exists():
-            return cand
+        cand_name = f"{safe_stem}_{i}{suffix}"
+        if not _name_taken(out_dir, cand_name, taken, taken_folded):
+            _take(cand_name, taken, taken_folded)
+            return out_dir / cand_name
 
     raise RuntimeError(f"too many duplicate filenames for url: {url}")
 
 
-def _rewrite_markdown_images(markdown: str, *, project_dir: Path, md_path: Path, url_to_rel: dict[str, str]) -> str:
-    # mdファイルから見た相対パスに変換して置換
-    md_dir = md_path.parent
+def _name_taken(out_dir: Path, name: str, taken: set[str], taken_folded: set[str]) -> bool:
+    if name in taken:
+        return True
+    # 大文字小文字だけ違う名前があるときは、従来どおり exists() に任せる（macOS 等の区別しない FS では衝突になる）
+    if name.casefold() in taken_folded:
+        return (out_dir / name).exists()
+    return False
+
+
+def _take(name: str, taken: set[str], taken_folded: set[str]) -> None:
+    taken.add(name)
+    taken_folded.add(name.casefold())
+
 
+def _rewrite_markdown_images(
+    markdown: str,
+    refs: list[_ImageRef],
+    *,
+    project_dir: Path,
+    md_path: Path,
+    url_to_rel: dict[str, str],
+) -> str:
+    if not url_to_rel or not refs:
+        return markdown
+
+    # mdファイルから見た相対パスに変換して置換（project_dir は呼び出し側で resolve 済み）
+    md_dir = md_path.parent.resolve()
+
+    @functools.lru_cache(maxsize=None)
     def to_local(url: str) -> str:
         rel = url_to_rel.get(url)
         if not rel:
             return url
-        abs_path = (project_dir / rel).resolve()
-        return os.path.relpath(abs_path, start=md_dir.resolve()).replace(os.sep, "/")
-
-    def repl_md(m: re.Match) -> str:
-        url = m.group(1).strip()
-        return m.group(0).replace(url, to_local(url))
+        return os.path.relpath(project_dir / rel, start=md_dir).replace(os.sep, "/")
 
-    def repl_html(m: re.Match) -> str:
-        url = m.group(1).strip()
-        return m.group(0).replace(url, to_local(url))
-
-    out = _md_image_re.sub(repl_md, markdown)
-    out = _html_img_re.sub(repl_html, out)
-    return out
+    pieces: list[str] = []
+    pos = 0
+    for ref in refs:
+        local = to_local(ref.url)
+        if local == ref.url:
+            continue
+        pieces.append(markdown[pos : ref.start])
+        pieces.append(markdown[ref.start : ref.end].replace(ref.url, local))
+        pos = ref.end
+    pieces.append(markdown[pos:])
+    return "".join(pieces)
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import io
 import json
+import os
 import re
+import shutil
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
 from .init_project import init_project
 
 
+_docx_heading_re = re.compile(r"heading\s*(\d+)")
+_digits_re = re.compile(r"(\d+)")
+_slug_drop_re = re.compile(r"[^0-9a-zA-Zぁ-んァ-ヶ一-龠ー_-]+")
+# ASCII のみの場合に _slug_drop_re で落とす文字を空白へ寄せる変換表（連続は split/join で1つの "_" になる）
+_slug_ascii_table = str.maketrans({chr(c): " " for c in range(128) if not (chr(c).isalnum() or chr(c) in "_-")})
+
+_EXTRACT_WORKERS = 8
+
+
 @dataclass(frozen=True)
 class ImportedFile:
     project_dir: Path
@@ -37,32 +50,34 @@ def import_file(
         raise ValueError(f"unsupported file type: {suffix} (supported: .md .txt .docx .pptx)")
 
     slug = slug or _suggest_slug_from_filename(in_path.name)
-    project_dir = init_project(slug).resolve()
+    project_dir = init_project(slug, title=title or slug).resolve()
 
     md_path = project_dir / "source" / "article.md"
     if md_path.exists() and not force:
         raise FileExistsError(f"already exists: {md_path} (use --force to overwrite)")
 
     copied = project_dir / "source" / f"input{suffix}"
-    copied.write_bytes(in_path.read_bytes())
+    # 入力は1回だけ読み、コピー・テキスト変換・docx/pptx の解析すべてにこのバイト列を使う
+    data = in_path.read_bytes()
+    copied.write_bytes(data)
 
     assets_images_src = project_dir / "assets" / "images" / "source"
     if extract_images and suffix in {".docx", ".pptx"}:
-        _extract_office_images(in_path, assets_images_src)
+        _extract_office_images(data, suffix=suffix, out_dir=assets_images_src)
 
     if suffix == ".md":
-        md = in_path.read_text(encoding="utf-8", errors="replace")
-        md_path.write_text(md if md.endswith("\n") else md + "\n", encoding="utf-8")
+        md = _decode_text(data)
+        _write_markdown(md_path, [md] if md.endswith("\n") else [md, "\n"])
     elif suffix == ".txt":
-        text = in_path.read_text(encoding="utf-8", errors="replace").strip()
-        md = _text_to_markdown(text, title=title or slug, images_dir=assets_images_src if assets_images_src.exists() else None)
-        md_path.write_text(md, encoding="utf-8")
+        text = _decode_text(data).strip()
+        parts = _text_to_markdown(text, title=title or slug, images_dir=assets_images_src if assets_images_src.exists() else None)
+        _write_markdown(md_path, parts)
     elif suffix == ".docx":
-        md = _docx_to_markdown(in_path, title=title or slug, images_dir=assets_images_src if assets_images_src.exists() else None)
-        md_path.write_text(md, encoding="utf-8")
+        parts = _docx_to_markdown(data, name=in_path.name, title=title or slug, images_dir=assets_images_src if assets_images_src.exists() else None)
+        _write_markdown(md_path, parts)
     elif suffix == ".pptx":
-        md = _pptx_to_markdown(in_path, title=title or slug, images_dir=assets_images_src if assets_images_src.exists() else None)
-        md_path.write_text(md, encoding="utf-8")
+        parts = _pptx_to_markdown(data, name=in_path.name, title=title or slug, images_dir=assets_images_src if assets_images_src.exists() else None)
+        _write_markdown(md_path, parts)
 
     _maybe_update_project_title(project_dir, title=title or slug, slug=slug)
 
@@ -74,9 +89,27 @@ def import_file(
     )
 
 
+_WRITE_BUFFER = 1 << 20
+
+
+def _write_markdown(path: Path, parts: list[str]) -> None:
+    # 変換結果は断片のリストのまま受け取り、1つの文字列に連結せず大きいバッファで書き出す
+    with path.open("w", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+        f.writelines(parts)
+
+
+def _decode_text(data: bytes) -> str:
+    # Path.read_text と同じく改行を \n に揃える
+    text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
 def _suggest_slug_from_filename(name: str) -> str:
     stem = Path(name).stem.strip().lower()
-    stem = re.sub(r"[^0-9a-zA-Zぁ-んァ-ヶ一-龠ー_-]+", "_", stem).strip("_")
+    if stem.isascii():
+        stem = "_".join(stem.translate(_slug_ascii_table).split()).strip("_")
+    else:
+        stem = _slug_drop_re.sub("_", stem).strip("_")
     return stem or "project"
 
 
@@ -90,7 +123,7 @@ def _maybe_update_project_title(project_dir: Path, *, title: str, slug: str) ->
         return
     if not isinstance(data, dict):
         return
-    if data.get("title") not in (None, "", slug):
+    if data.get("title") not in (None, "", slug) or data.get("title") == title:
         return
     data["title"] = title
     project_json.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
@@ -106,45 +139,128 @@ def _frontmatter(*, source: str, title: str) -> str:
     )
 
 
-def _text_to_markdown(text: str, *, title: str, images_dir: Path | None) -> str:
+def _text_to_markdown(text: str, *, title: str, images_dir: Path | None) -> list[str]:
     out = [_frontmatter(source="text", title=title)]
     if images_dir and images_dir.exists():
         out.append(_images_section(images_dir))
-    out.append(text.strip() + "\n")
-    return "".join(out)
+    out.append(text.strip())
+    out.append("\n")
+    return out
 
 
-def _docx_to_markdown(docx_path: Path, *, title: str, images_dir: Path | None) -> str:
-    _require_python_docx()
-    from docx import Document  # type: ignore[import-not-found]
+def _docx_to_markdown(data: bytes, *, name: str, title: str, images_dir: Path | None) -> list[str]:
+    # lxml で document.xml を直接読む。使えない場合は python-docx で読む
+    paragraphs = _docx_paragraphs_lxml(data)
+    if paragraphs is None:
+        paragraphs = _docx_paragraphs_python_docx(data)
 
-    doc = Document(str(docx_path))
-    out: list[str] = [_frontmatter(source=str(docx_path.name), title=title)]
+    out: list[str] = [_frontmatter(source=name, title=title)]
     if images_dir and images_dir.exists():
         out.append(_images_section(images_dir))
 
-    for p in doc.paragraphs:
-        txt = (p.text or "").strip()
+    for text, style in paragraphs:
+        txt = text.strip()
         if not txt:
             continue
-        style = (p.style.name or "").lower() if getattr(p, "style", None) is not None else ""
         level = _docx_heading_level(style)
         if level:
             out.append(f"{'#' * level} {txt}\n\n")
         else:
             out.append(txt + "\n\n")
-    return "".join(out)
+    return out
+
+
+def _docx_paragraphs_python_docx(data: bytes) -> list[tuple[str, str]]:
+    Document = _import_docx_document()
+    doc = Document(io.BytesIO(data))
+    out: list[tuple[str, str]] = []
+    for p in doc.paragraphs:
+        style = (p.style.name or "").lower() if getattr(p, "style", None) is not None else ""
+        out.append((p.text or "", style))
+    return out
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# w:r の子要素のうち、固定の文字になるもの（python-docx の Run.text と同じ対応）
+_DOCX_RUN_CHARS = {f"{_W}tab": "\t", f"{_W}cr": "\n", f"{_W}noBreakHyphen": "-", f"{_W}ptab": "\t"}
+
+
+def _docx_paragraphs_lxml(data: bytes) -> list[tuple[str, str]] | None:
+    """
+    Returns (text, lowercased style name) for each body paragraph, matching python-docx's
+    `Document.paragraphs` / `Paragraph.text` / `Paragraph.style.name`.
+    Returns None when lxml is unavailable or the package layout is not the usual one.
+    """
+    try:
+        from lxml import etree  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        names = set(z.namelist())
+        if "word/document.xml" not in names or "word/styles.xml" not in names:
+            return None
+        document_xml = z.read("word/document.xml")
+        styles_xml = z.read("word/styles.xml")
+
+    # python-docx と同じパーサ設定（外部実体は展開しない）
+    parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+    body = etree.fromstring(document_xml, parser).find(f"{_W}body")
+    if body is None:
+        return None
+    style_names, default_style = _docx_paragraph_styles(etree.fromstring(styles_xml, parser))
+
+    out: list[tuple[str, str]] = []
+    for p in body.iterchildren(f"{_W}p"):
+        parts: list[str] = []
+        for child in p.iterchildren(f"{_W}r", f"{_W}hyperlink"):
+            runs = [child] if child.tag == f"{_W}r" else child.iterchildren(f"{_W}r")
+            for r in runs:
+                for e in r:
+                    tag = e.tag
+                    if tag == f"{_W}t":
+                        parts.append(e.text or "")
+                    elif tag == f"{_W}br":
+                        if e.get(f"{_W}type", "textWrapping") == "textWrapping":
+                            parts.append("\n")
+                    elif tag in _DOCX_RUN_CHARS:
+                        parts.append(_DOCX_RUN_CHARS[tag])
+        p_style = p.find(f"{_W}pPr/{_W}pStyle")
+        style_id = p_style.get(f"{_W}val") if p_style is not None else None
+        style = style_names.get(style_id, default_style) if style_id is not None else default_style
+        out.append(("".join(parts), style))
+    return out
+
+
+def _docx_paragraph_styles(styles_root) -> tuple[dict[str, str], str]:
+    # styleId -> 小文字のスタイル名（段落スタイルのみ）。未知の ID は既定の段落スタイル扱い
+    names: dict[str, str] = {}
+    seen_ids: set[str] = set()
+    default = ""
+    for st in styles_root.iterchildren(f"{_W}style"):
+        is_paragraph = st.get(f"{_W}type", "paragraph") == "paragraph"
+        name_el = st.find(f"{_W}name")
+        name = ((name_el.get(f"{_W}val") if name_el is not None else None) or "").lower()
+        # 同じ ID が複数ある場合は先頭のものを使う
+        style_id = st.get(f"{_W}styleId")
+        if style_id is not None and style_id not in seen_ids:
+            seen_ids.add(style_id)
+            if is_paragraph:
+                names[style_id] = name
+        if is_paragraph and st.get(f"{_W}default") in ("1", "true", "on"):
+            default = name
+    return names, default
 
 
 def _docx_heading_level(style_name_lower: str) -> int | None:
     # Common: "Heading 1", "Heading 2", ... ; also allow Japanese names heuristically.
-    m = re.search(r"heading\\s*(\\d+)", style_name_lower)
+    m = _docx_heading_re.search(style_name_lower)
     if m:
         lvl = int(m.group(1))
         return max(1, min(6, lvl))
     if "見出し" in style_name_lower:
         # e.g. 見出し 1
-        m2 = re.search(r"(\\d+)", style_name_lower)
+        m2 = _digits_re.search(style_name_lower)
         if m2:
             lvl = int(m2.group(1))
             return max(1, min(6, lvl))
@@ -152,12 +268,10 @@ def _docx_heading_level(style_name_lower: str) -> int | None:
     return None
 
 
-def _pptx_to_markdown(pptx_path: Path, *, title: str, images_dir: Path | None) -> str:
-    _require_python_pptx()
-    from pptx import Presentation  # type: ignore[import-not-found]
-
-    pres = Presentation(str(pptx_path))
-    out: list[str] = [_frontmatter(source=str(pptx_path.name), title=title)]
+def _pptx_to_markdown(data: bytes, *, name: str, title: str, images_dir: Path | None) -> list[str]:
+    Presentation = _import_pptx_presentation()
+    pres = Presentation(io.BytesIO(data))
+    out: list[str] = [_frontmatter(source=name, title=title)]
     if images_dir and images_dir.exists():
         out.append(_images_section(images_dir))
 
@@ -168,7 +282,7 @@ def _pptx_to_markdown(pptx_path: Path, *, title: str, images_dir: Path | None) -
         for b in bullets:
             out.append(f"- {b}\n")
         out.append("\n")
-    return "".join(out)
+    return out
 
 
 def _pptx_slide_title(slide) -> str | None:
@@ -208,35 +322,45 @@ def _pptx_slide_bullets(slide) -> list[str]:
 
 def _images_section(images_dir: Path) -> str:
     # Put extracted images at top so they can be picked up later if needed.
-    rels = sorted([p for p in images_dir.iterdir() if p.is_file()])
-    if not rels:
+    # DirEntry は種別をキャッシュしているので、エントリごとの stat が要らない
+    with os.scandir(images_dir) as it:
+        names = sorted(e.name for e in it if e.is_file())
+    if not names:
         return ""
     lines = ["## 添付画像（抽出）\n\n"]
-    for p in rels:
-        lines.append(f"![]({p.as_posix()})\n\n")
+    for name in names:
+        lines.append(f"![]({(images_dir / name).as_posix()})\n\n")
     return "".join(lines)
 
 
-def _extract_office_images(in_path: Path, out_dir: Path) -> None:
+def _extract_office_images(data: bytes, *, suffix: str, out_dir: Path) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(in_path) as z:
-        names = z.namelist()
-        if in_path.suffix.lower() == ".docx":
-            media_prefix = "word/media/"
-        else:
-            media_prefix = "ppt/media/"
-
-        extracted = 0
-        for name in names:
-            if not name.startswith(media_prefix):
-                continue
-            filename = Path(name).name
-            if not filename:
+    if suffix == ".docx":
+        media_prefix = "word/media/"
+    else:
+        media_prefix = "ppt/media/"
+
+    # 出力はファイル名（basename）だけで作るので、同名のメンバーは書き出す前に1つに絞る。
+    # 順番に上書きしていた頃と同じく、アーカイブ内で後にあるものを残す（並列に書いても結果が決まる）
+    by_name: dict[str, str] = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        for info in z.infolist():
+            if info.is_dir() or not info.filename.startswith(media_prefix):
                 continue
-            data = z.read(name)
-            (out_dir / filename).write_bytes(data)
-            extracted += 1
-    if extracted == 0:
+            filename = Path(info.filename).name
+            if filename:
+                by_name.pop(filename, None)
+                by_name[filename] = info.filename
+    members = list(by_name.values())
+
+    if members:
+        # ZipFile は同一ハンドルの並列読み出しに対応していないので、ワーカーごとに開き直して分担する
+        workers = min(_EXTRACT_WORKERS, len(members))
+        batches = [members[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for _ in ex.map(lambda names: _extract_members(data, names, out_dir), batches):
+                pass
+    else:
         # Keep directory empty if nothing was found.
         try:
             out_dir.rmdir()
@@ -244,21 +368,32 @@ def _extract_office_images(in_path: Path, out_dir: Path) -> None:
             pass
 
 
-def _require_python_docx() -> None:
+def _extract_members(data: bytes, names: list[str], out_dir: Path) -> None:
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        for name in names:
+            # 画像全体をメモリに載せず、チャンク単位でコピーする
+            with z.open(name) as src, open(out_dir / Path(name).name, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 16)
+
+
+def _import_docx_document():
+    # 可用性チェックと本体の import を1回で済ませる
     try:
-        import docx  # noqa: F401
+        from docx import Document  # type: ignore[import-not-found]
     except Exception as e:
         raise RuntimeError(
             "docx の取り込みには python-docx が必要です。\n"
             "インストール: python -m pip install -r requirements.txt"
         ) from e
+    return Document
 
 
-def _require_python_pptx() -> None:
+def _import_pptx_presentation():
     try:
-        import pptx  # noqa: F401
+        from pptx import Presentation  # type: ignore[import-not-found]
     except Exception as e:
         raise RuntimeError(
             "pptx の取り込みには python-pptx が必要です。\n"
             "インストール: python -m pip install -r requirements.txt"
         ) from e
+    return Presentation
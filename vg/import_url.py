@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import codecs
 import gzip
+import hashlib
 import json
+import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from html import unescape
 from html.parser import HTMLParser
 from pathlib import Path
@@ -12,6 +17,7 @@ from typing import Any, Iterable
 from urllib.parse import urljoin, urlparse
 from urllib.request import Request, urlopen
 
+from . import __version__
 from .images import fetch_images
 from .init_project import init_project
 
@@ -23,7 +29,7 @@ class ImportedArticle:
     final_url: str
     title: str
     md_relpath: str
-    html_relpath: str
+    html_relpath: str | None
 
 
 def import_url(
@@ -33,21 +39,31 @@ def import_url(
     force: bool = False,
     fetch_article_images: bool = False,
     rewrite_images: bool = False,
+    save_html: bool = True,
+    use_cache: bool = True,
 ) -> ImportedArticle:
     html, final_url, title = _fetch_html(url)
     slug = slug or _suggest_slug(final_url, title)
 
-    project_dir = init_project(slug).resolve()
+    project_dir = init_project(slug, title=title).resolve()
     md_path = project_dir / "source" / "article.md"
     html_path = project_dir / "source" / "article.html"
 
     if md_path.exists() and not force:
         raise FileExistsError(f"already exists: {md_path} (use --force to overwrite)")
 
-    html_path.write_text(html, encoding="utf-8")
-
-    md = _html_to_markdown(html, base_url=final_url, title=title)
-    md_path.write_text(md, encoding="utf-8")
+    if save_html:
+        # 生HTMLの保存は Markdown 変換と独立しているので、別スレッドで並行して書く
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            html_written = ex.submit(_write_text, html_path, html)
+            md = _html_to_markdown(html, base_url=final_url, title=title, use_cache=use_cache)
+            md_path.write_text(md, encoding="utf-8")
+            html_written.result()
+    else:
+        # 以前の取り込みで保存した HTML が残っていると、画像取得や visuals がそちらを読んでしまうので消す
+        html_path.unlink(missing_ok=True)
+        md = _html_to_markdown(html, base_url=final_url, title=title, use_cache=use_cache)
+        md_path.write_text(md, encoding="utf-8")
 
     _maybe_update_project_title(project_dir, title=title, slug=slug)
 
@@ -65,10 +81,15 @@ def import_url(
         final_url=final_url,
         title=title,
         md_relpath="source/article.md",
-        html_relpath="source/article.html",
+        html_relpath="source/article.html" if save_html else None,
     )
 
 
+def _write_text(path: Path, text: str) -> None:
+    with path.open("w", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+        f.write(text)
+
+
 def _fetch_html(url: str) -> tuple[str, str, str]:
     req = Request(
         url,
@@ -82,42 +103,101 @@ def _fetch_html(url: str) -> tuple[str, str, str]:
     )
     with urlopen(req) as resp:
         final_url = resp.geturl()
-        data = resp.read()
+        stream = resp
         if resp.headers.get("Content-Encoding", "").lower() == "gzip":
-            data = gzip.decompress(data)
-
-        encoding = resp.headers.get_content_charset() or _sniff_charset(data) or "utf-8"
-        html = data.decode(encoding, errors="replace")
+            stream = gzip.GzipFile(fileobj=resp)
+
+        # 先頭だけ読んで文字コードを決め、残りはチャンクごとに逐次デコードする
+        head = _read_at_most(stream, _SNIFF_BYTES)
+        encoding = resp.headers.get_content_charset() or _sniff_charset(head) or "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        parts = [decoder.decode(head)]
+        total = len(head)
+        while True:
+            chunk = stream.read(_READ_CHUNK)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > _MAX_HTML_BYTES:
+                raise ValueError(f"HTML is too large: >{_MAX_HTML_BYTES} bytes ({final_url})")
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        html = "".join(parts)
 
     title = _extract_title(html) or _fallback_title_from_url(final_url)
     return html, final_url, title
 
 
-_charset_re = re.compile(br"charset\s*=\s*['\"]?([A-Za-z0-9._-]+)", re.IGNORECASE)
+_SNIFF_BYTES = 20_000
+_READ_CHUNK = 64 * 1024
+_WRITE_BUFFER = 1 << 20
+_MAX_HTML_BYTES = 64 * 1024 * 1024
+
+
+def _read_at_most(stream: Any, size: int) -> bytes:
+    # HTTPResponse / GzipFile の read(n) は n 未満で返ることがあるので、size に達するか EOF まで読む
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = stream.read(size - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    return bytes(buf)
+
+
+# charset 宣言の読み取り用（正規表現 br"charset\s*=\s*['\"]?([A-Za-z0-9._-]+)" と同じ規則）
+_ASCII_SPACE = frozenset(b" \t\n\r\f\v")
+_CHARSET_NAME_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-")
+_og_title_re = re.compile(
+    r"""<meta\s+[^>]*(?:property|name)=["']og:title["'][^>]*content=["']([^"']+)["'][^>]*>""",
+    re.IGNORECASE,
+)
+_title_re = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_slug_drop_re = re.compile(r"[^0-9a-zA-Zぁ-んァ-ヶ一-龠ー_-]+")
+# ASCII のみの場合に _slug_drop_re で落とす文字を空白へ寄せる変換表（連続は split/join で1つの "_" になる）
+_slug_ascii_table = str.maketrans({chr(c): " " for c in range(128) if not (chr(c).isalnum() or chr(c) in "_-")})
+_blank_lines_re = re.compile(r"\n{3,}")
+# 空白を1つに詰めた後の文字列に対して使う（句読点の直前の空白を消す）
+_space_before_punct_re = re.compile(r" ([,.;:!?。、！？])")
 
 
 def _sniff_charset(data: bytes) -> str | None:
-    head = data[:20_000]
-    m = _charset_re.search(head)
-    if not m:
-        return None
-    try:
-        return m.group(1).decode("ascii", errors="ignore") or None
-    except Exception:
+    head = data[:_SNIFF_BYTES]
+    lowered = head.lower()
+    i = lowered.find(b"charset")
+    while i >= 0:
+        name = _charset_value_at(head, i + len(b"charset"))
+        if name:
+            return name.decode("ascii")
+        i = lowered.find(b"charset", i + 1)
+    return None
+
+
+def _charset_value_at(head: bytes, j: int) -> bytes | None:
+    # "charset" の直後から `\s*=\s*['"]?名前` を読む
+    n = len(head)
+    while j < n and head[j] in _ASCII_SPACE:
+        j += 1
+    if j >= n or head[j] != ord("="):
         return None
+    j += 1
+    while j < n and head[j] in _ASCII_SPACE:
+        j += 1
+    if j < n and head[j] in b"'\"":
+        j += 1
+    k = j
+    while k < n and head[k] in _CHARSET_NAME_BYTES:
+        k += 1
+    return head[j:k] or None
 
 
 def _extract_title(html: str) -> str | None:
     # Prefer OpenGraph title if present.
-    m = re.search(
-        r"""<meta\s+[^>]*(?:property|name)=["']og:title["'][^>]*content=["']([^"']+)["'][^>]*>""",
-        html,
-        flags=re.IGNORECASE,
-    )
+    m = _og_title_re.search(html)
     if m:
         return _clean_text(m.group(1))
 
-    m = re.search(r"<title[^>]*>(.*?)</title>", html, flags=re.IGNORECASE | re.DOTALL)
+    m = _title_re.search(html)
     if m:
         return _clean_text(m.group(1))
     return None
@@ -133,7 +213,10 @@ def _suggest_slug(url: str, title: str) -> str:
     parsed = urlparse(url)
     base = Path(parsed.path).stem or parsed.netloc or title or "article"
     base = base.strip().lower()
-    base = re.sub(r"[^0-9a-zA-Zぁ-んァ-ヶ一-龠ー_-]+", "_", base).strip("_")
+    if base.isascii():
+        base = "_".join(base.translate(_slug_ascii_table).split()).strip("_")
+    else:
+        base = _slug_drop_re.sub("_", base).strip("_")
     return base or "article"
 
 
@@ -149,19 +232,18 @@ def _maybe_update_project_title(project_dir: Path, *, title: str, slug: str) ->
 
     if not isinstance(data, dict):
         return
-    if data.get("title") not in (None, "", slug):
+    if data.get("title") not in (None, "", slug) or data.get("title") == title:
         return
 
     data["title"] = title
     project_json.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
 
-def _html_to_markdown(html: str, *, base_url: str, title: str) -> str:
-    doc = _HtmlDoc.parse(html)
-    main = doc.pick_main() or doc.root
-
-    rendered = _MarkdownRenderer(base_url=base_url).render(main).strip()
-    rendered = _collapse_blank_lines(rendered)
+def _html_to_markdown(html: str, *, base_url: str, title: str, use_cache: bool = True) -> str:
+    if use_cache and os.environ.get("VG_HTML2MD_CACHE", "1") != "0":
+        body = _render_body_cached(html, base_url=base_url)
+    else:
+        body = _render_body(html, base_url=base_url)
 
     front = [
         "---",
@@ -172,24 +254,123 @@ def _html_to_markdown(html: str, *, base_url: str, title: str) -> str:
         f"# {title}",
         "",
     ]
-    body = rendered
+    return "\n".join(front) + (body + "\n" if body else "")
+
+
+def _render_body(html: str, *, base_url: str) -> str:
+    doc = _HtmlDoc.parse(html)
+    main = doc.pick_main() or doc.root
+
+    rendered = _MarkdownRenderer(base_url=base_url).render(main).strip()
+    body = _collapse_blank_lines(rendered)
     if body.startswith("# "):
         # Avoid double H1.
         body = "\n".join(body.splitlines()[1:]).lstrip()
+    return body
+
+
+def _render_body_cached(html: str, *, base_url: str) -> str:
+    """
+    Memoizes `_render_body` on disk (~/.cache/vg/html2md), keyed by the HTML, base URL,
+    package version, this module's source and the parser backend. Cache I/O errors are ignored.
+    At most `_HTML2MD_CACHE_MAX_ENTRIES` files are kept; the least recently used are pruned.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_render_cache_salt())
+    h.update(base_url.encode("utf-8", errors="surrogatepass") + b"\0")
+    h.update(html.encode("utf-8", errors="surrogatepass"))
+    cache_dir = _html2md_cache_dir()
+    cache_path = cache_dir / f"{h.hexdigest()}.md"
+
+    try:
+        body = cache_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        pass
+    else:
+        # 使ったエントリの mtime を更新して、削除対象（古い順）から外す
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return body
+
+    body = _render_body(html, base_url=base_url)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(body, encoding="utf-8")
+        os.replace(tmp, cache_path)
+        _prune_html2md_cache(cache_dir)
+    except OSError:
+        pass
+    return body
+
+
+# html2md キャッシュに残すファイル数（超えたら最終利用が古いものから消す）
+_HTML2MD_CACHE_MAX_ENTRIES = 256
+
+
+def _prune_html2md_cache(cache_dir: Path) -> None:
+    entries: list[tuple[int, str]] = []
+    with os.scandir(cache_dir) as it:
+        for e in it:
+            if e.name.endswith(".md") and e.is_file():
+                entries.append((e.stat().st_mtime_ns, e.path))
+    if len(entries) <= _HTML2MD_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, path in entries[: len(entries) - _HTML2MD_CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
 
-    return "\n".join(front) + (body + "\n" if body else "")
+
+def _html2md_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "vg" / "html2md"
+
+
+@lru_cache(maxsize=1)
+def _render_cache_salt() -> bytes:
+    # 変換ロジック（このファイル）や HTML パーサが変わったら別キーになるようにする
+    try:
+        source = Path(__file__).read_bytes()
+    except OSError:
+        source = b""
+    backend = b"lexbor" if _lexbor_parser() is not None else b"stdlib"
+    return b"\0".join([__version__.encode(), hashlib.blake2b(source, digest_size=16).digest(), backend, b""])
+
+
+@lru_cache(maxsize=1)
+def _lexbor_parser() -> Any:
+    # 実際に使う selectolax.lexbor を import できるかで判定する（lexbor 無しの selectolax もある）
+    try:
+        from selectolax.lexbor import LexborHTMLParser  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return LexborHTMLParser
 
 
 def _collapse_blank_lines(text: str) -> str:
-    return re.sub(r"\n{3,}", "\n\n", text).strip() + "\n"
+    return _blank_lines_re.sub("\n\n", text).strip() + "\n"
 
 
 def _clean_text(s: str) -> str:
-    s = unescape(s)
-    s = re.sub(r"\s+", " ", s).strip()
-    s = re.sub(r"\s+([,.;:!?])", r"\1", s)
-    s = re.sub(r"\s+([。、！？])", r"\1", s)
-    return s
+    return _collapse_spaces(unescape(s))
+
+
+def _collapse_spaces(s: str) -> str:
+    # str.split() の空白判定は正規表現の \s と同じ
+    s = " ".join(s.split())
+    return _space_before_punct_re.sub(r"\1", s)
+
+
+# 本文候補を探すときに中身を辿らない要素
+_SKIP_SUBTREE = frozenset({"script", "style", "noscript", "svg", "nav", "header", "footer"})
+
+# _clean_text が直前の空白を詰める句読点
+_NO_SPACE_BEFORE = frozenset(",.;:!?。、！？")
 
 
 @dataclass
@@ -197,12 +378,47 @@ class _Node:
     tag: str
     attrs: dict[str, str]
     children: list["_Node | str"] = field(default_factory=list)
-
-    def iter_nodes(self) -> Iterable["_Node"]:
-        yield self
-        for c in self.children:
-            if isinstance(c, _Node):
-                yield from c.iter_nodes()
+    _text_len: int | None = field(default=None, init=False, repr=False, compare=False)
+    _text_head: str = field(default="", init=False, repr=False, compare=False)
+
+    def iter_nodes(self, *, prune: bool = True) -> Iterable["_Node"]:
+        """
+        Pre-order walk. With `prune`, nodes whose tag is in `_SKIP_SUBTREE` are
+        yielded but their descendants are not visited.
+        """
+        stack: list[_Node] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            if prune and node.tag in _SKIP_SUBTREE:
+                continue
+            stack.extend(c for c in reversed(node.children) if isinstance(c, _Node))
+
+    def text_len(self) -> int:
+        """
+        Returns `len(_clean_text(self.text_content()))` without building the string.
+        Computed once per node from the (cached) child lengths, so scoring every
+        candidate container is linear in the DOM size.
+        """
+        if self._text_len is None:
+            total = 0
+            head = ""
+            if self.tag not in {"script", "style", "noscript", "svg"}:
+                for c in self.children:
+                    if isinstance(c, str):
+                        n, h = len(c), c[:1]
+                    else:
+                        n, h = c.text_len(), c._text_head
+                    if n == 0:
+                        continue
+                    if not total:
+                        head = h
+                    elif h not in _NO_SPACE_BEFORE:
+                        total += 1  # " ".join の区切り
+                    total += n
+            self._text_len = total
+            self._text_head = head
+        return self._text_len
 
     def text_content(self) -> str:
         if self.tag in {"script", "style", "noscript", "svg"}:
@@ -249,46 +465,63 @@ class _HtmlDoc:
 
     @staticmethod
     def parse(html: str) -> "_HtmlDoc":
-        parser = _TreeBuilder()
-        parser.feed(html)
-        parser.close()
-        return _HtmlDoc(root=parser.root)
+        lexbor_parser = _lexbor_parser()
+        if lexbor_parser is None:
+            # selectolax は任意依存。無ければ標準ライブラリの HTMLParser でツリーを作る。
+            parser = _TreeBuilder()
+            parser.feed(html)
+            parser.close()
+            return _HtmlDoc(root=parser.root)
+        return _HtmlDoc(root=_tree_from_lexbor(lexbor_parser(html)))
 
     def pick_main(self) -> _Node | None:
-        # Prefer semantic containers if present.
-        preferred = ("article", "main")
-        for tag in preferred:
-            best = self._pick_largest_by_tag(tag)
-            if best is not None:
-                return best
-
-        # Otherwise pick the largest content-ish container.
-        best_node: _Node | None = None
-        best_score = 0
-        for n in self.root.iter_nodes():
-            if n.tag not in {"div", "section"}:
-                continue
-            if _looks_like_navigation(n):
-                continue
-            score = len(_clean_text(n.text_content()))
-            if score > best_score:
-                best_score = score
-                best_node = n
-        return best_node
-
-    def _pick_largest_by_tag(self, tag: str) -> _Node | None:
-        best_node: _Node | None = None
-        best_score = 0
+        # article / main / div・section それぞれの最大候補を1回の走査で集める
+        best: dict[str, tuple[int, _Node]] = {}
         for n in self.root.iter_nodes():
-            if n.tag != tag:
+            kind = _MAIN_CANDIDATE_KINDS.get(n.tag)
+            if kind is None:
                 continue
             if _looks_like_navigation(n):
                 continue
-            score = len(_clean_text(n.text_content()))
-            if score > best_score:
-                best_score = score
-                best_node = n
-        return best_node
+            score = n.text_len()
+            if score > best.get(kind, (0, n))[0]:
+                best[kind] = (score, n)
+
+        # Prefer semantic containers if present; otherwise pick the largest content-ish container.
+        for kind in ("article", "main", "block"):
+            if kind in best:
+                return best[kind][1]
+        return None
+
+
+_MAIN_CANDIDATE_KINDS = {"article": "article", "main": "main", "div": "block", "section": "block"}
+
+
+def _tree_from_lexbor(tree: Any) -> _Node:
+    # C 実装の lexbor でパースした DOM を _Node ツリーに写す（テキストは _TreeBuilder と同じく _clean_text 済み）
+    root = _Node("document", {})
+    if tree.root is None:
+        return root
+
+    def new_node(el: Any) -> _Node:
+        return _Node(el.tag.lower(), {k.lower(): (v or "") for k, v in el.attributes.items()})
+
+    html_node = new_node(tree.root)
+    root.children.append(html_node)
+    # 深い入れ子でも再帰上限に当たらないよう、明示的なスタックで辿る
+    stack: list[tuple[Any, _Node]] = [(tree.root, html_node)]
+    while stack:
+        src, dst = stack.pop()
+        for c in src.iter(include_text=True):
+            if c.is_text_node:
+                txt = _clean_text(c.text_content or "")
+                if txt:
+                    dst.children.append(txt)
+            elif c.is_element_node:
+                node = new_node(c)
+                dst.children.append(node)
+                stack.append((c, node))
+    return root
 
 
 def _looks_like_navigation(n: _Node) -> bool:
@@ -331,11 +564,12 @@ class _MarkdownRenderer:
 
         if tag == "blockquote":
             buf: list[str] = []
+            # list_stack はコピーせず共有し、子の描画後に元の深さへ戻す
+            depth = len(list_stack)
             for c in node.children:
                 if isinstance(c, _Node):
-                    tmp: list[str] = []
-                    self._render_block(c, tmp, list_stack=list_stack.copy())
-                    buf.extend(tmp)
+                    self._render_block(c, buf, list_stack=list_stack)
+                    del list_stack[depth:]
                 else:
                     buf.append(_clean_text(c))
             quote = "\n".join([b for b in buf if b.strip()]).strip()
@@ -396,13 +630,13 @@ class _MarkdownRenderer:
                     lines.append("")
 
     def _render_inline_children(self, node: _Node) -> str:
+        # テキスト子ノードはパース時に _clean_text 済みなので、そのまま連結して最後に1回だけ空白を整える
         parts: list[str] = []
         for c in node.children:
-            if isinstance(c, str):
-                parts.append(_clean_text(c))
-            else:
-                parts.append(self._render_inline(c))
-        return _clean_text(" ".join([p for p in parts if p.strip()]))
+            p = c if isinstance(c, str) else self._render_inline(c)
+            if p and not p.isspace():
+                parts.append(p)
+        return _collapse_spaces(" ".join(parts))
 
     def _render_inline(self, node: _Node) -> str:
         tag = node.tag
@@ -4,21 +4,42 @@ import json
 from pathlib import Path
 
 
-def init_project(slug: str) -> Path:
-    root = Path("projects") / slug
-    (root / "source").mkdir(parents=True, exist_ok=True)
-    (root / "script" / "segments").mkdir(parents=True, exist_ok=True)
-    (root / "assets" / "images").mkdir(parents=True, exist_ok=True)
-    (root / "assets" / "slides").mkdir(parents=True, exist_ok=True)
-    (root / "assets" / "bgm").mkdir(parents=True, exist_ok=True)
+_PROJECT_DIRS = (
+    ("source",),
+    ("script", "segments"),
+    ("assets", "images"),
+    ("assets", "slides"),
+    ("assets", "bgm"),
+)
+
+# このプロセスで初期化済みのプロジェクト（絶対パス）。project.json が消えていたら作り直す
+_initialized: set[Path] = set()
+
+
+def init_project(slug: str, *, title: str | None = None) -> Path:
+    """
+    Creates `projects/<slug>` with the standard layout (idempotent).
 
+    `title` is only used when `project.json` is created here, so importers can set the
+    article title without a second read/write of the file.
+    """
+    root = Path("projects") / slug
     project_json = root / "project.json"
+    key = root.absolute()
+    if key in _initialized and project_json.exists():
+        return root
+
+    for parts in _PROJECT_DIRS:
+        d = root.joinpath(*parts)
+        if not d.is_dir():
+            d.mkdir(parents=True, exist_ok=True)
+
     if not project_json.exists():
         project_json.write_text(
             json.dumps(
                 {
                     "slug": slug,
-                    "title": slug,
+                    "title": title or slug,
                     "tts": {
                         "provider": "voicevox",
                         "base_url": "http://localhost:50021",
@@ -52,4 +73,5 @@ def init_project(slug: str) -> Path:
             encoding="utf-8",
         )
 
+    _initialized.add(key)
     return root
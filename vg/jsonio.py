@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:
+    # orjson は任意依存。無ければ標準ライブラリの json で同じ形式を書き出す。
+    orjson = None
+
+
+def dumps_pretty(data: Any) -> bytes:
+    """
+    Serializes `data` as UTF-8 JSON with 2-space indent and a trailing newline, laid out like
+    `json.dumps(..., ensure_ascii=False, indent=2) + "\\n"` (non-str dict keys are coerced the same way).
+    With orjson, floats use the shortest round-trip form (`1e-7`, not `1e-07`) and NaN/Infinity
+    are written as `null` instead of the non-standard `NaN`/`Infinity`.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(data, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def dumps_compact(data: Any) -> bytes:
+    """Serializes `data` as compact UTF-8 JSON (for request bodies); same caveats as `dumps_pretty`."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Parses UTF-8 JSON bytes (e.g. an HTTP response body) without decoding to str first."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def write_json(path: Path, data: Any) -> None:
+    path.write_bytes(dumps_pretty(data))
+
+
+def read_json(path: Path) -> Any:
+    """Parses a UTF-8 JSON file (orjson straight from bytes when available)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def read_json_cached(path: Path) -> Any:
+    """
+    Like `read_json`, but reuses the parsed value while the file's (mtime, size) is unchanged.
+    The returned object is shared between callers and must not be mutated.
+    """
+    st = path.stat()
+    return _read_json_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    return read_json(Path(path))
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from .audio import read_wav_info
+from .ffmpeg_env import ffmpeg_has_filter, ffmpeg_path
+from .jsonio import read_json
+from .project import load_project
+from .render import (
+    SEGMENT_WORKERS,
+    collect_article_images_by_title,
+    concat_segments,
+    find_fallback_image,
+    index_images,
+    load_long_settings,
+    render_segment,
+)
+from .timeline import build_timeline
+from .tts import TTS_WORKERS, resolve_tts_settings, synthesize_segment
+from .voicevox import VoiceVoxClient
+
+
+def render_pipelined(
+    project_dir: Path,
+    out: str | None,
+    fontfile: str | None,
+    force: bool,
+    base_url: str | None = None,
+    speaker: int | None = None,
+) -> None:
+    """
+    TTS → timeline → render (per-segment + concat) with TTS and rendering overlapped:
+    each segment's mp4 is encoded as soon as its wav is available, while later segments
+    are still being synthesized. Existing wavs are reused; `force` re-renders segment mp4s.
+    """
+    if ffmpeg_path() is None:
+        raise RuntimeError(
+            "ffmpeg が見つかりません。macOS なら `brew install ffmpeg` の後に再実行してください。"
+        )
+
+    project = load_project(project_dir)
+    settings = load_long_settings(project)
+    has_drawtext = ffmpeg_has_filter("drawtext")
+    if not has_drawtext:
+        print("WARN: ffmpeg に drawtext フィルタが無いため、プレースホルダーにはタイトル文字を描画しません。")
+
+    segments_json = project.path("script", "segments.json")
+    if not segments_json.exists():
+        raise FileNotFoundError(f"segments.json not found: {segments_json}")
+    segments = read_json(segments_json)
+    if not segments:
+        raise RuntimeError(f"segments.json にセグメントがありません: {segments_json}")
+
+    audio_dir = project.path("audio")
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    segments_dir = project.path("render", "segments_long")
+    segments_dir.mkdir(parents=True, exist_ok=True)
+
+    article_images_by_title = collect_article_images_by_title(project)
+    segment_images = index_images(project.path("assets", "images"))
+    fallback_image = find_fallback_image(project, segment_images)
+    # vg tts と同じく、引数の指定 → project.json の順で決める
+    tts_base_url, tts_speaker = resolve_tts_settings(project, base_url=base_url, speaker=speaker)
+    client = VoiceVoxClient(base_url=tts_base_url)
+
+    def render_one(idx: int, seg: dict, synthesized: bool) -> Path:
+        seg_id = seg["id"]
+        duration = read_wav_info(audio_dir / f"{seg_id}.wav").duration_sec
+        item = {
+            "id": seg_id,
+            "title": seg.get("title") or seg_id,
+            "start": 0.0,
+            "end": round(duration, 3),
+            "wav_path": f"audio/{seg_id}.wav",
+        }
+        return render_segment(
+            project,
+            idx=idx,
+            item=item,
+            segments_dir=segments_dir,
+            settings=settings,
+            segment_images=segment_images,
+            article_images_by_title=article_images_by_title,
+            fallback_image=fallback_image,
+            fontfile=fontfile,
+            drawtext_enabled=has_drawtext,
+            # 今回作り直した wav の古いセグメント mp4 は使わない
+            force=force or synthesized,
+        )
+
+    # 生産者: TTS（I/O 待ち）、消費者: セグメントのエンコード（CPU）。wav ができた順にエンコードへ回す
+    seg_mp4s: list[Path | None] = [None] * len(segments)
+    with ThreadPoolExecutor(max_workers=TTS_WORKERS) as tts_ex, ThreadPoolExecutor(
+        max_workers=SEGMENT_WORKERS
+    ) as render_ex:
+        tts_futures: dict[Future, int] = {}
+        for i, seg in enumerate(segments):
+            fut = tts_ex.submit(
+                synthesize_segment,
+                project,
+                seg,
+                client=client,
+                out_dir=audio_dir,
+                default_speaker=tts_speaker,
+                base_url=tts_base_url,
+                force=False,
+            )
+            tts_futures[fut] = i
+        render_futures: dict[Future, int] = {}
+        pending: set[Future] = set(tts_futures)
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    if fut in tts_futures:
+                        i = tts_futures[fut]
+                        synthesized = fut.result()
+                        rf = render_ex.submit(render_one, i + 1, segments[i], synthesized)
+                        render_futures[rf] = i
+                        pending.add(rf)
+                    else:
+                        seg_mp4s[render_futures[fut]] = fut.result()
+        except BaseException:
+            for fut in list(tts_futures) + list(render_futures):
+                fut.cancel()
+            raise
+
+    # 全 wav が揃ったのでタイムラインを確定し、セグメントを連結する
+    build_timeline(project.root, concat_wav=False)
+
+    out_path = project.path(out) if out else project.path("export", "master_long.mp4")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    concat_segments(project, [p for p in seg_mp4s if p is not None], out_path=out_path, settings=settings)
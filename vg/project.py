@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+import functools
 import json
 from dataclasses import dataclass
 from pathlib import Path
@@ -30,8 +32,17 @@ class Project:
 def load_project(project_dir: Path) -> Project:
     project_dir = project_dir.resolve()
     config_path = project_dir / "project.json"
-    if not config_path.exists():
-        raise FileNotFoundError(f"project.json not found: {config_path}")
-    config = json.loads(config_path.read_text(encoding="utf-8"))
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"project.json not found: {config_path}") from None
+    # 呼び出し側が config を書き換えてもキャッシュが汚れないようにコピーを渡す
+    config = copy.deepcopy(_read_config(str(config_path), st.st_mtime_ns, st.st_size))
     return Project(root=project_dir, config=config)
 
+
+@functools.lru_cache(maxsize=16)
+def _read_config(path: str, mtime_ns: int, size: int) -> Any:
+    # mtime/size をキーに含めるので、ファイルが更新されれば自動的に読み直される
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
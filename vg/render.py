@@ -1,36 +1,61 @@
 from __future__ import annotations
 
 import json
+import os
 import re
-import shutil
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+from .ffmpeg_env import (
+    ffmpeg_has_filter,
+    ffmpeg_path,
+    filter_complex_file_args,
+    resolve_video_encoder,
+    run_ffmpeg,
+    video_codec_args,
+)
 from .project import load_project
 
+# セグメントの並列エンコード数と、1プロセスあたりの x264 スレッド数（合計でおおよそコア数になるように）
+SEGMENT_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+# 1回の ffmpeg にまとめるセグメント数の上限（1セグメントで入力を2つ開くので、これを超えると
+# fd 数や入力ごとのデコーダのメモリが効いてくる。超えたらセグメントごとに書き出して連結する）
+_SINGLE_PASS_MAX_SEGMENTS = 100
+_SEGMENT_THREADS = 2
+
 
 @dataclass(frozen=True)
 class RenderSettings:
     width: int
     height: int
     fps: int
+    encoder: str
 
 
-def render_long(project_dir: Path, out: str | None, fontfile: str | None, force: bool) -> None:
-    if shutil.which("ffmpeg") is None:
+def render_long(
+    project_dir: Path,
+    out: str | None,
+    fontfile: str | None,
+    force: bool,
+    legacy_concat: bool = False,
+) -> None:
+    if ffmpeg_path() is None:
         raise RuntimeError(
             "ffmpeg が見つかりません。macOS なら `brew install ffmpeg` の後に再実行してください。"
         )
 
     project = load_project(project_dir)
-    settings = _load_long_settings(project)
-    has_drawtext = _ffmpeg_has_filter("drawtext")
+    settings = load_long_settings(project)
+    has_drawtext = ffmpeg_has_filter("drawtext")
     if not has_drawtext:
         print("WARN: ffmpeg に drawtext フィルタが無いため、プレースホルダーにはタイトル文字を描画しません。")
 
-    article_images_by_title = _collect_article_images_by_title(project)
-    fallback_image = _find_fallback_image(project)
+    article_images_by_title = collect_article_images_by_title(project)
+    # 画像ディレクトリは1回だけ列挙し、セグメントごとの存在確認は辞書引きにする
+    segment_images = index_images(project.path("assets", "images"))
+    fallback_image = find_fallback_image(project, segment_images)
 
     timeline_path = project.path("script", "timeline.json")
     if not timeline_path.exists():
@@ -41,55 +66,84 @@ def render_long(project_dir: Path, out: str | None, fontfile: str | None, force:
     segments_dir = project.path("render", "segments_long")
     segments_dir.mkdir(parents=True, exist_ok=True)
 
-    seg_mp4s: list[Path] = []
+    if not items:
+        raise RuntimeError(f"timeline.json にセグメントがありません: {timeline_path}")
+
+    jobs: list[tuple[int, dict]] = []
     for idx, item in enumerate(items, start=1):
-        seg_id = item["id"]
-        title = item.get("title") or seg_id
         wav_path = project.path(item["wav_path"])
         if not wav_path.exists():
             raise FileNotFoundError(f"wav not found: {wav_path}")
+        jobs.append((idx, item))
 
-        duration = float(item["end"]) - float(item["start"])
-        mp4_path = segments_dir / f"{idx:04d}_{seg_id}.mp4"
-        seg_mp4s.append(mp4_path)
+    out_path = project.path(out) if out else project.path("export", "master_long.mp4")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if mp4_path.exists() and not force:
-            continue
+    if not legacy_concat and len(jobs) > _SINGLE_PASS_MAX_SEGMENTS:
+        print(
+            f"INFO: セグメントが {len(jobs)} 個あるため（上限 {_SINGLE_PASS_MAX_SEGMENTS}）、"
+            "セグメントごとに mp4 を書き出してから連結します。"
+        )
+        legacy_concat = True
+
+    if not legacy_concat:
+        # 全セグメントを1回の ffmpeg で filter_complex の concat に通す（中間 mp4 と再エンコードが無い）
+        # 再利用する中間 mp4 が無いので、毎回全体を書き出す（--force は関係しない）
+        _render_long_single_pass(
+            project,
+            jobs,
+            out_path=out_path,
+            segments_dir=segments_dir,
+            settings=settings,
+            segment_images=segment_images,
+            article_images_by_title=article_images_by_title,
+            fallback_image=fallback_image,
+            fontfile=fontfile,
+            drawtext_enabled=has_drawtext,
+        )
+        return
 
-        img = _find_segment_image(project, seg_id)
-        if img is None:
-            img = _pick_article_image(article_images_by_title, title)
-        if img is None and fallback_image is not None:
-            img = fallback_image
-        if img is None:
-            _render_placeholder_segment(
-                out_path=mp4_path,
-                wav_path=wav_path,
-                duration=duration,
-                title=title,
-                settings=settings,
-                fontfile=fontfile,
-                drawtext_enabled=has_drawtext,
-            )
-        else:
-            _render_image_segment(
-                out_path=mp4_path,
-                image_path=img,
-                wav_path=wav_path,
-                duration=duration,
-                settings=settings,
-            )
+    # セグメント同士は独立しているので、ffmpeg を並列に走らせる（出力順は items の順のまま）
+    def render_one(job: tuple[int, dict]) -> Path:
+        idx, item = job
+        return render_segment(
+            project,
+            idx=idx,
+            item=item,
+            segments_dir=segments_dir,
+            settings=settings,
+            segment_images=segment_images,
+            article_images_by_title=article_images_by_title,
+            fallback_image=fallback_image,
+            fontfile=fontfile,
+            drawtext_enabled=has_drawtext,
+            force=force,
+        )
+
+    workers = max(1, min(SEGMENT_WORKERS, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(render_one, job) for job in jobs]
+        try:
+            seg_mp4s = [f.result() for f in futures]
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+    concat_segments(project, seg_mp4s, out_path=out_path, settings=settings)
 
+
+def concat_segments(project, seg_mp4s: list[Path], *, out_path: Path, settings: RenderSettings) -> None:
+    """Concatenates per-segment mp4s (in order) into `out_path` via `render/concat_long.txt`."""
     concat_list = project.path("render", "concat_long.txt")
     concat_list.parent.mkdir(parents=True, exist_ok=True)
-    lines = []
+    # 行ごとの文字列を作って join せず、バイト列に直接積んで1回で書き出す
+    buf = bytearray()
     for p in seg_mp4s:
-        rel = p.relative_to(concat_list.parent)
-        lines.append(f"file '{rel.as_posix()}'")
-    concat_list.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-    out_path = project.path(out) if out else project.path("export", "master_long.mp4")
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+        buf += b"file '"
+        buf += p.relative_to(concat_list.parent).as_posix().encode("utf-8")
+        buf += b"'\n"
+    concat_list.write_bytes(buf)
 
     # まずは stream copy を試し、ダメなら再エンコードで確実に通す
     _run_ffmpeg(
@@ -116,16 +170,11 @@ def render_long(project_dir: Path, out: str | None, fontfile: str | None, force:
             "0",
             "-i",
             str(concat_list),
-            "-c:v",
-            "libx264",
+            *video_codec_args(settings.encoder),
             "-pix_fmt",
             "yuv420p",
             "-r",
             str(settings.fps),
-            "-preset",
-            "veryfast",
-            "-crf",
-            "18",
             "-c:a",
             "aac",
             "-b:a",
@@ -135,56 +184,265 @@ def render_long(project_dir: Path, out: str | None, fontfile: str | None, force:
     )
 
 
-def _load_long_settings(project) -> RenderSettings:
+def render_segment(
+    project,
+    *,
+    idx: int,
+    item: dict,
+    segments_dir: Path,
+    settings: RenderSettings,
+    segment_images: dict[str, Path],
+    article_images_by_title: dict[str, list[Path]],
+    fallback_image: Path | None,
+    fontfile: str | None,
+    drawtext_enabled: bool,
+    force: bool,
+) -> Path:
+    """Encodes one timeline item into `segments_dir/{idx:04d}_{id}.mp4` (kept as is unless `force`)."""
+    seg_id = item["id"]
+    title = item.get("title") or seg_id
+    wav_path = project.path(item["wav_path"])
+    duration = float(item["end"]) - float(item["start"])
+    mp4_path = segments_dir / f"{idx:04d}_{seg_id}.mp4"
+
+    if mp4_path.exists() and not force:
+        return mp4_path
+
+    img = _choose_segment_image(
+        project,
+        seg_id=seg_id,
+        title=title,
+        segment_images=segment_images,
+        article_images_by_title=article_images_by_title,
+        fallback_image=fallback_image,
+    )
+    if img is None:
+        _render_placeholder_segment(
+            out_path=mp4_path,
+            wav_path=wav_path,
+            duration=duration,
+            title=title,
+            settings=settings,
+            fontfile=fontfile,
+            drawtext_enabled=drawtext_enabled,
+        )
+    else:
+        _render_image_segment(
+            out_path=mp4_path,
+            image_path=img,
+            wav_path=wav_path,
+            duration=duration,
+            settings=settings,
+        )
+    return mp4_path
+
+
+def _choose_segment_image(
+    project,
+    *,
+    seg_id: str,
+    title: str,
+    segment_images: dict[str, Path],
+    article_images_by_title: dict[str, list[Path]],
+    fallback_image: Path | None,
+) -> Path | None:
+    img = _find_segment_image(segment_images, seg_id)
+    if img is None:
+        img = _pick_article_image(article_images_by_title, title)
+    if img is None:
+        img = fallback_image
+    return img
+
+
+def _render_long_single_pass(
+    project,
+    jobs: list[tuple[int, dict]],
+    *,
+    out_path: Path,
+    segments_dir: Path,
+    settings: RenderSettings,
+    segment_images: dict[str, Path],
+    article_images_by_title: dict[str, list[Path]],
+    fallback_image: Path | None,
+    fontfile: str | None,
+    drawtext_enabled: bool,
+) -> None:
+    w, h, fps = settings.width, settings.height, settings.fps
+    args = ["ffmpeg", "-y"]
+    graph: list[str] = []
+    concat_in: list[str] = []
+
+    for n, (idx, item) in enumerate(jobs):
+        seg_id = item["id"]
+        title = item.get("title") or seg_id
+        duration = float(item["end"]) - float(item["start"])
+        img = _choose_segment_image(
+            project,
+            seg_id=seg_id,
+            title=title,
+            segment_images=segment_images,
+            article_images_by_title=article_images_by_title,
+            fallback_image=fallback_image,
+        )
+
+        # 入力は映像・音声の順に2つずつ: 映像 = 2n, 音声 = 2n+1
+        if img is None:
+            args += ["-f", "lavfi", "-t", f"{duration:.3f}", "-i", f"color=c=black:s={w}x{h}:r={fps}"]
+            chain = ""
+            if drawtext_enabled:
+                title_file = segments_dir / f"{idx:04d}_{seg_id}.txt"
+                title_file.write_text(title + "\n", encoding="utf-8")
+                chain = _placeholder_drawtext(title_file, fontfile) + ","
+            v = f"[{2 * n}:v]{chain}format=yuv420p,setsar=1[v{n}]"
+        else:
+            args += ["-loop", "1", "-t", f"{duration:.3f}", "-i", str(img)]
+            v = f"[{2 * n}:v]{_fit_filter(img, w, h)}fps={fps},format=yuv420p,setsar=1[v{n}]"
+        args += ["-i", str(project.path(item["wav_path"]))]
+        # 音声はセグメント長ちょうどに揃える（各セグメント単体で -shortest を付けていたのと同じ長さ）
+        a = f"[{2 * n + 1}:a]apad,atrim=duration={duration:.3f}[a{n}]"
+        graph += [v, a]
+        concat_in.append(f"[v{n}][a{n}]")
+
+    graph.append("".join(concat_in) + f"concat=n={len(jobs)}:v=1:a=1[v][a]")
+
+    # セグメント数が多いとコマンドラインが長くなるので、フィルタグラフはファイル経由で渡す
+    graph_path = project.path("render", "filter_long.txt")
+    graph_path.parent.mkdir(parents=True, exist_ok=True)
+    graph_path.write_text(";\n".join(graph) + "\n", encoding="utf-8")
+
+    args += [
+        *filter_complex_file_args(graph_path),
+        "-map",
+        "[v]",
+        "-map",
+        "[a]",
+        "-r",
+        str(fps),
+        *video_codec_args(settings.encoder),
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "aac",
+        "-b:a",
+        "192k",
+        str(out_path),
+    ]
+    _run_ffmpeg(args)
+
+
+def _fit_filter(image_path: Path, width: int, height: int) -> str:
+    # 画像が出力と同じ大きさなら scale/pad は恒等変換なので、フィルタごと省く
+    if _image_size(image_path) == (width, height):
+        return ""
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color=black,"
+    )
+
+
+@lru_cache(maxsize=256)
+def _image_size(image_path: Path) -> tuple[int, int] | None:
+    # Pillow はヘッダだけ読む（画素はデコードしない）。Pillow が無い・読めない画像は None（従来どおり scale/pad を通す）
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(image_path) as im:
+            # EXIF の向きで縦横が入れ替わる JPEG は、ffmpeg 側の扱いとずれ得るので対象外にする
+            if im.getexif().get(0x0112, 1) != 1:
+                return None
+            return im.size
+    except OSError:
+        return None
+
+
+def _placeholder_drawtext(title_file: Path, fontfile: str | None) -> str:
+    draw = (
+        f"drawtext=textfile='{title_file.as_posix()}':reload=0:"
+        "fontcolor=white:fontsize=64:x=(w-text_w)/2:y=(h-text_h)/2"
+    )
+    if fontfile:
+        draw = (
+            f"drawtext=fontfile='{Path(fontfile).as_posix()}':"
+            f"textfile='{title_file.as_posix()}':reload=0:"
+            "fontcolor=white:fontsize=64:x=(w-text_w)/2:y=(h-text_h)/2"
+        )
+    return draw
+
+
+def load_long_settings(project) -> RenderSettings:
     video = project.config.get("video", {})
     long_cfg = video.get("long", {}) if isinstance(video, dict) else {}
     width = int(long_cfg.get("width", 1920))
     height = int(long_cfg.get("height", 1080))
     fps = int(long_cfg.get("fps", 30))
-    return RenderSettings(width=width, height=height, fps=fps)
+    encoder = resolve_video_encoder(long_cfg.get("encoder"))
+    return RenderSettings(width=width, height=height, fps=fps, encoder=encoder)
 
 
-def _find_segment_image(project, seg_id: str) -> Path | None:
-    base = project.path("assets", "images")
-    for ext in ("png", "jpg", "jpeg"):
-        p = base / f"{seg_id}.{ext}"
-        if p.exists():
-            return p
-    return None
+_IMAGE_EXTS = ("png", "jpg", "jpeg")
 
 
-def _find_fallback_image(project) -> Path | None:
-    # 章画像が見つからない場合の共通フォールバック
-    candidates = [
-        project.path("assets", "images", "fallback.png"),
-        project.path("assets", "images", "fallback.jpg"),
-        project.path("assets", "images", "fallback.jpeg"),
-        project.path("assets", "images", "article", "fallback.png"),
-        project.path("assets", "images", "article", "fallback.jpg"),
-        project.path("assets", "images", "article", "fallback.jpeg"),
-    ]
-    for p in candidates:
-        if p.exists():
+def index_images(directory: Path) -> dict[str, Path]:
+    # ファイル名 -> パス。加えて小文字化した名前でも引けるようにしておく（実在する名前が優先）。
+    # 小文字キーで当たったときだけ、従来どおり exists() で確かめる（大文字小文字を区別しない FS でだけ見つかる）
+    out: dict[str, Path] = {}
+    try:
+        with os.scandir(directory) as it:
+            names = [e.name for e in it if e.is_file()]
+    except FileNotFoundError:
+        return out
+    for name in names:
+        out[name] = directory / name
+    for name in names:
+        out.setdefault(name.lower(), directory / name)
+    return out
+
+
+def _find_segment_image(images: dict[str, Path], seg_id: str) -> Path | None:
+    for ext in _IMAGE_EXTS:
+        name = f"{seg_id}.{ext}"
+        p = images.get(name)
+        if p is not None and p.name == name:
             return p
+        folded = images.get(name.lower())
+        if folded is not None:
+            candidate = folded.parent / name
+            if candidate.exists():
+                return candidate
     return None
 
 
+def find_fallback_image(project, images: dict[str, Path]) -> Path | None:
+    # 章画像が見つからない場合の共通フォールバック（assets/images → assets/images/article の順）
+    p = _find_segment_image(images, "fallback")
+    if p is None:
+        p = _find_segment_image(index_images(project.path("assets", "images", "article")), "fallback")
+    return p
+
+
 _md_heading_re = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
-_md_image_re = re.compile(r"!\[[^\]]*\]\(([^)]+)\)")
-_html_img_re = re.compile(r"""<img[^>]+src=["']([^"']+)["'][^>]*>""", re.IGNORECASE)
+# Markdown 画像（group 1）と <img src>（group 2）を1回の走査で拾う
+_image_ref_re = re.compile(
+    r"""!\[[^\]]*\]\(([^)]+)\)|<img[^>]+src=["']([^"']+)["'][^>]*>""",
+    re.IGNORECASE,
+)
 
 
-def _collect_article_images_by_title(project) -> dict[str, list[Path]]:
+def collect_article_images_by_title(project) -> dict[str, list[Path]]:
     md_path = project.path("source", "article.md")
     if not md_path.exists():
         return {}
 
     text = md_path.read_text(encoding="utf-8")
+    md_dir = md_path.parent.resolve()
+    listings: dict[Path, dict[str, str]] = {}
     current_title: str | None = None
     out: dict[str, list[Path]] = {}
 
     for line in text.splitlines():
-        m = _md_heading_re.match(line)
+        m = _md_heading_re.match(line) if line.startswith("#") else None
         if m:
             current_title = m.group(2).strip()
             out.setdefault(current_title, [])
@@ -192,44 +450,67 @@ def _collect_article_images_by_title(project) -> dict[str, list[Path]]:
         if current_title is None:
             continue
 
-        for img in _extract_images_from_line(md_path, line):
+        if "![" not in line and "<" not in line:
+            continue
+        for img in _extract_images_from_line(md_dir, line, listings):
             out[current_title].append(img)
 
     # 重複排除（順序は保持）
     for k, imgs in out.items():
-        seen: set[Path] = set()
-        deduped: list[Path] = []
-        for p in imgs:
-            if p in seen:
-                continue
-            seen.add(p)
-            deduped.append(p)
-        out[k] = deduped
+        out[k] = list(dict.fromkeys(imgs))
 
     return out
 
 
-def _extract_images_from_line(md_path: Path, line: str) -> list[Path]:
-    urls: list[str] = []
-    for m in _md_image_re.finditer(line):
-        urls.append(m.group(1).strip())
-    for m in _html_img_re.finditer(line):
-        urls.append(m.group(1).strip())
+def _extract_images_from_line(md_dir: Path, line: str, listings: dict[Path, dict[str, str]]) -> list[Path]:
+    # 従来どおり Markdown 画像を先、<img> を後に並べる
+    md_urls: list[str] = []
+    html_urls: list[str] = []
+    for m in _image_ref_re.finditer(line):
+        if m.group(1) is not None:
+            md_urls.append(m.group(1).strip())
+        else:
+            html_urls.append(m.group(2).strip())
 
     paths: list[Path] = []
-    for url in urls:
+    for url in md_urls + html_urls:
         # "path title" 形式の title は削る（雑に最初の空白で分割）
         url = url.strip().strip("<>")
         if " " in url:
             url = url.split(" ", 1)[0].strip()
         if url.startswith(("http://", "https://")):
             continue
-        candidate = (md_path.parent / url).resolve()
-        if candidate.exists():
+        # resolve() はシンボリックリンクも辿る（重複排除もこの実体パスで行う）
+        candidate = (md_dir / url).resolve()
+        if _exists_in_listing(candidate, listings):
             paths.append(candidate)
     return paths
 
 
+def _exists_in_listing(path: Path, listings: dict[Path, dict[str, str]]) -> bool:
+    # ディレクトリごとに1回だけ列挙して、存在確認は辞書の検索にする（実在する名前 -> 小文字化した別名の順）。
+    # 大文字小文字だけ違う名前しか無いときは、従来どおり exists() に任せる（区別しない FS でだけ見つかる）
+    names = listings.get(path.parent)
+    if names is None:
+        names = {}
+        try:
+            with os.scandir(path.parent) as it:
+                entries = [e.name for e in it]
+        except OSError:
+            entries = []
+        for name in entries:
+            names[name] = name
+        for name in entries:
+            names.setdefault(name.lower(), name)
+        listings[path.parent] = names
+    real = names.get(path.name)
+    if real == path.name:
+        return True
+    if names.get(path.name.lower()) is not None:
+        return path.exists()
+    return False
+
+
 def _pick_article_image(images_by_title: dict[str, list[Path]], title: str) -> Path | None:
     imgs = images_by_title.get(title)
     if imgs:
@@ -245,11 +526,7 @@ def _render_image_segment(
     duration: float,
     settings: RenderSettings,
 ) -> None:
-    vf = (
-        f"scale={settings.width}:{settings.height}:force_original_aspect_ratio=decrease,"
-        f"pad={settings.width}:{settings.height}:(ow-iw)/2:(oh-ih)/2:color=black,"
-        "format=yuv420p"
-    )
+    vf = _fit_filter(image_path, settings.width, settings.height) + "format=yuv420p"
     _run_ffmpeg(
         [
             "ffmpeg",
@@ -266,18 +543,15 @@ def _render_image_segment(
             vf,
             "-r",
             str(settings.fps),
-            "-c:v",
-            "libx264",
+            *video_codec_args(settings.encoder),
             "-pix_fmt",
             "yuv420p",
-            "-preset",
-            "veryfast",
-            "-crf",
-            "18",
             "-c:a",
             "aac",
             "-b:a",
             "192k",
+            "-threads",
+            str(_SEGMENT_THREADS),
             "-shortest",
             str(out_path),
         ]
@@ -298,18 +572,7 @@ def _render_placeholder_segment(
     if drawtext_enabled:
         title_file = out_path.with_suffix(".txt")
         title_file.write_text(title + "\n", encoding="utf-8")
-
-        draw = (
-            f"drawtext=textfile='{title_file.as_posix()}':reload=0:"
-            "fontcolor=white:fontsize=64:x=(w-text_w)/2:y=(h-text_h)/2"
-        )
-        if fontfile:
-            draw = (
-                f"drawtext=fontfile='{Path(fontfile).as_posix()}':"
-                f"textfile='{title_file.as_posix()}':reload=0:"
-                "fontcolor=white:fontsize=64:x=(w-text_w)/2:y=(h-text_h)/2"
-            )
-        vf = draw
+        vf = _placeholder_drawtext(title_file, fontfile)
 
     args = [
         "ffmpeg",
@@ -326,18 +589,15 @@ def _render_placeholder_segment(
     if vf:
         args += ["-vf", vf]
     args += [
-        "-c:v",
-        "libx264",
+        *video_codec_args(settings.encoder),
         "-pix_fmt",
         "yuv420p",
-        "-preset",
-        "veryfast",
-        "-crf",
-        "18",
         "-c:a",
         "aac",
         "-b:a",
         "192k",
+        "-threads",
+        str(_SEGMENT_THREADS),
         "-shortest",
         str(out_path),
     ]
@@ -345,31 +605,13 @@ def _render_placeholder_segment(
 
 
 def _run_ffmpeg(args: list[str], retry_with_reencode: bool = False, reencode_args: list[str] | None = None) -> None:
-    proc = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if proc.returncode == 0:
+    returncode, tail = run_ffmpeg(args)
+    if returncode == 0:
         return
     if retry_with_reencode and reencode_args:
-        proc2 = subprocess.run(reencode_args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if proc2.returncode == 0:
+        returncode2, tail2 = run_ffmpeg(reencode_args)
+        if returncode2 == 0:
             return
-        tail = "\n".join((proc2.stderr or "").splitlines()[-40:])
-        raise RuntimeError(f"ffmpeg failed (reencode). args={reencode_args}\n{tail}")
+        raise RuntimeError(f"ffmpeg failed (reencode). args={reencode_args}\n{tail2}")
 
-    tail = "\n".join((proc.stderr or "").splitlines()[-40:])
     raise RuntimeError(f"ffmpeg failed. args={args}\n{tail}")
-
-
-def _ffmpeg_has_filter(name: str) -> bool:
-    try:
-        proc = subprocess.run(
-            ["ffmpeg", "-hide_banner", "-filters"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return False
-
-    hay = proc.stdout or ""
-    return bool(re.search(rf"(^|\s){re.escape(name)}(\s|$)", hay, flags=re.MULTILINE))
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
 
+from .jsonio import write_json
+
 
 @dataclass(frozen=True)
 class Segment:
@@ -29,13 +30,27 @@ def _strip_yaml_frontmatter(markdown: str) -> str:
     return markdown
 
 
+_code_span_re = re.compile(r"`([^`]+)`")
+_bold_re = re.compile(r"\*\*([^*]+)\*\*")
+_italic_re = re.compile(r"\*([^*]+)\*")
+_image_re = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+_link_re = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_quote_re = re.compile(r"^>\s?", re.MULTILINE)
+
+
 def _strip_markdown(text: str) -> str:
-    text = re.sub(r"`([^`]+)`", r"\1", text)
-    text = re.sub(r"\*\*([^*]+)\*\*", r"\1", text)
-    text = re.sub(r"\*([^*]+)\*", r"\1", text)
-    text = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", r"\1", text)
-    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r"\1", text)
-    text = re.sub(r"^>\s?", "", text, flags=re.MULTILINE)
+    # 置換は前の結果に対して順に効くので1本の正規表現にはまとめない。
+    # 代わりに、記号が含まれないパスは `in` の判定だけで飛ばす（普通の本文ではほとんど飛ばせる）
+    if "`" in text:
+        text = _code_span_re.sub(r"\1", text)
+    if "*" in text:
+        text = _bold_re.sub(r"\1", text)
+        text = _italic_re.sub(r"\1", text)
+    if "](" in text:
+        text = _image_re.sub(r"\1", text)
+        text = _link_re.sub(r"\1", text)
+    if ">" in text:
+        text = _quote_re.sub("", text)
     return text
 
 
@@ -62,7 +77,8 @@ def split_markdown_into_segments(markdown: str) -> list[Segment]:
         buf = []
 
     for line in lines:
-        m = _md_heading_re.match(line)
+        # 見出しは必ず行頭の '#' で始まるので、それ以外の行では正規表現を走らせない
+        m = _md_heading_re.match(line) if line.startswith("#") else None
         if m:
             flush()
             current_title = m.group(2).strip()
@@ -77,16 +93,30 @@ def split_markdown_into_segments(markdown: str) -> list[Segment]:
     return out
 
 
+_slug_ws_re = re.compile(r"\s+")
+_slug_drop_re = re.compile(r"[^0-9a-zA-Z_ぁ-んァ-ヶ一-龠ー]+")
+# ASCII のみの場合に _slug_drop_re と同じ文字を落とす変換表
+_slug_ascii_drop = str.maketrans("", "", "".join(chr(c) for c in range(128) if not (chr(c).isalnum() or c == ord("_"))))
+
+
 def _slugify(s: str) -> str:
     s = s.strip().lower()
-    s = re.sub(r"\s+", "_", s)
-    s = re.sub(r"[^0-9a-zA-Z_ぁ-んァ-ヶ一-龠ー]+", "", s)
+    if s.isascii():
+        # 英語の見出しは Unicode の文字クラスを引かずに split/translate で処理する
+        s = "_".join(s.split()).translate(_slug_ascii_drop)
+    else:
+        s = _slug_ws_re.sub("_", s)
+        s = _slug_drop_re.sub("", s)
     return s[:40].strip("_")
 
 
+_spaces_re = re.compile(r"[ \t]+")
+_blank_lines_re = re.compile(r"\n{3,}")
+
+
 def _normalize_text(s: str) -> str:
-    s = re.sub(r"[ \t]+", " ", s)
-    s = re.sub(r"\n{3,}", "\n\n", s)
+    s = _spaces_re.sub(" ", s)
+    s = _blank_lines_re.sub("\n\n", s)
     return s.strip()
 
 
@@ -109,7 +139,4 @@ def build_script_segments(project_dir: Path, source_relpath: str = "source/artic
         index.append({"id": seg.id, "title": seg.title, "text_path": f"script/segments/{seg.id}.txt"})
 
     (project_dir / "script").mkdir(parents=True, exist_ok=True)
-    (project_dir / "script" / "segments.json").write_text(
-        json.dumps(index, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+    write_json(project_dir / "script" / "segments.json", index)
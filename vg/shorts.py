@@ -2,11 +2,18 @@ from __future__ import annotations
 
 import json
 import re
-import shutil
-import subprocess
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+from .ffmpeg_env import (
+    ffmpeg_has_filter,
+    ffmpeg_path,
+    probe_video_stream,
+    resolve_video_encoder,
+    run_ffmpeg,
+    video_codec_args,
+)
 from .project import load_project
 
 
@@ -29,13 +36,13 @@ def render_shorts(
     fontfile: str | None,
     force: bool,
 ) -> None:
-    if shutil.which("ffmpeg") is None:
+    if ffmpeg_path() is None:
         raise RuntimeError(
             "ffmpeg が見つかりません。macOS なら `brew install ffmpeg` の後に再実行してください。"
         )
 
     project = load_project(project_dir)
-    has_drawtext = _ffmpeg_has_filter("drawtext")
+    has_drawtext = ffmpeg_has_filter("drawtext")
     if not has_drawtext:
         print("WARN: ffmpeg に drawtext フィルタが無いため、Shorts のタイトル文字は描画しません。")
 
@@ -49,6 +56,9 @@ def render_shorts(
     out_w = int(shorts_cfg.get("width", 1080))
     out_h = int(shorts_cfg.get("height", 1920))
     fps = int(shorts_cfg.get("fps", 30))
+    # 未指定なら長尺と同じエンコーダを使う
+    long_cfg = video_cfg.get("long", {}) if isinstance(video_cfg, dict) else {}
+    encoder = resolve_video_encoder(shorts_cfg.get("encoder", long_cfg.get("encoder")))
 
     resolved_out_dir = project.path(out_dir) if out_dir else project.path("export", "shorts")
     resolved_out_dir.mkdir(parents=True, exist_ok=True)
@@ -73,6 +83,7 @@ def render_shorts(
             out_w=out_w,
             out_h=out_h,
             fps=fps,
+            encoder=encoder,
             layout=layout,
             fontfile=fontfile,
             drawtext_enabled=has_drawtext,
@@ -100,6 +111,7 @@ def render_shorts(
             out_w=out_w,
             out_h=out_h,
             fps=fps,
+            encoder=encoder,
             layout=layout,
             fontfile=fontfile,
             drawtext_enabled=has_drawtext,
@@ -199,6 +211,7 @@ def _render_one_short(
     out_w: int,
     out_h: int,
     fps: int,
+    encoder: str,
     layout: ShortsLayout,
     fontfile: str | None,
     drawtext_enabled: bool,
@@ -214,20 +227,42 @@ def _render_one_short(
     cap_h = int(out_h * max(0.0, min(0.6, layout.caption_height_ratio)))
     fg_h = out_h - cap_h
 
-    # 背景: cover + blur
-    bg = (
-        f"[0:v]scale={out_w}:{out_h}:force_original_aspect_ratio=increase,"
-        f"crop={out_w}:{out_h},gblur=sigma=30[bg]"
-    )
-    # 前景: contain + pad（縦に撮り直した素材はそのままフィットしやすい）
-    fg = (
-        f"[0:v]scale={out_w}:{fg_h}:force_original_aspect_ratio=decrease,"
-        f"pad={out_w}:{fg_h}:(ow-iw)/2:(oh-ih)/2:color=black@0[fg]"
-    )
-    overlay = f"[bg][fg]overlay=0:0[v0]"
-    box = f"[v0]drawbox=x=0:y={fg_h}:w={out_w}:h={cap_h}:color=black@{layout.caption_box_alpha}:t=fill[v1]"
+    # キャプション帯もタイトルも無く（drawbox は h=0 だと全面を塗るので、透明度 0 のときだけ）、
+    # 元動画が出力と同じ解像度・fps・コーデック（H.264/AAC）なら、再エンコードしても同じ絵になる。
+    # その場合は再エンコードせずに切り出す（開始位置はキーフレーム単位になる）
+    if cap_h == 0 and layout.caption_box_alpha == 0 and not (title and drawtext_enabled):
+        info = probe_video_stream(src)
+        if (
+            info is not None
+            and (info.width, info.height) == (out_w, out_h)
+            and abs(info.fps - fps) < 0.01
+            and info.codec == "h264"
+            and all(c == "aac" for c in info.audio_codecs)
+        ):
+            _run_ffmpeg(
+                [
+                    "ffmpeg",
+                    "-y",
+                    "-ss",
+                    f"{start:.3f}",
+                    "-i",
+                    str(src),
+                    "-t",
+                    f"{duration:.3f}",
+                    "-map",
+                    "0:v:0",
+                    "-map",
+                    "0:a?",
+                    "-c",
+                    "copy",
+                    "-avoid_negative_ts",
+                    "make_zero",
+                    str(out_path),
+                ]
+            )
+            return
 
-    vf_chain = ";".join([bg, fg, overlay, box])
+    vf_chain = _layout_filter_chain(out_w, out_h, cap_h, layout.caption_box_alpha)
     if title and drawtext_enabled:
         title_file = out_path.with_suffix(".title.txt")
         title_file.write_text(title + "\n", encoding="utf-8")
@@ -265,14 +300,9 @@ def _render_one_short(
         "0:a?",
         "-r",
         str(fps),
-        "-c:v",
-        "libx264",
+        *video_codec_args(encoder),
         "-pix_fmt",
         "yuv420p",
-        "-preset",
-        "veryfast",
-        "-crf",
-        "18",
         "-c:a",
         "aac",
         "-b:a",
@@ -283,11 +313,29 @@ def _render_one_short(
     _run_ffmpeg(args)
 
 
+@lru_cache(maxsize=8)
+def _layout_filter_chain(out_w: int, out_h: int, cap_h: int, caption_box_alpha: float) -> str:
+    # 背景・前景・キャプション帯は1回の実行中どの Short でも同じなので、組み立ては1回で済ませる（出力は [v1]）
+    fg_h = out_h - cap_h
+    # 背景: cover + blur
+    bg = (
+        f"[0:v]scale={out_w}:{out_h}:force_original_aspect_ratio=increase,"
+        f"crop={out_w}:{out_h},gblur=sigma=30[bg]"
+    )
+    # 前景: contain + pad（縦に撮り直した素材はそのままフィットしやすい）
+    fg = (
+        f"[0:v]scale={out_w}:{fg_h}:force_original_aspect_ratio=decrease,"
+        f"pad={out_w}:{fg_h}:(ow-iw)/2:(oh-ih)/2:color=black@0[fg]"
+    )
+    overlay = f"[bg][fg]overlay=0:0[v0]"
+    box = f"[v0]drawbox=x=0:y={fg_h}:w={out_w}:h={cap_h}:color=black@{caption_box_alpha}:t=fill[v1]"
+    return ";".join([bg, fg, overlay, box])
+
+
 def _run_ffmpeg(args: list[str]) -> None:
-    proc = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if proc.returncode == 0:
+    returncode, tail = run_ffmpeg(args)
+    if returncode == 0:
         return
-    tail = "\n".join((proc.stderr or "").splitlines()[-40:])
     raise RuntimeError(f"ffmpeg failed. args={args}\n{tail}")
 
 
@@ -299,19 +347,3 @@ def _safe_stem(s: str) -> str:
     s = s.replace(" ", "_")
     s = _safe_stem_re.sub("", s)
     return s[:80] or "short"
-
-
-def _ffmpeg_has_filter(name: str) -> bool:
-    try:
-        proc = subprocess.run(
-            ["ffmpeg", "-hide_banner", "-filters"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            check=False,
-        )
-    except FileNotFoundError:
-        return False
-
-    hay = proc.stdout or ""
-    return bool(re.search(rf"(^|\s){re.escape(name)}(\s|$)", hay, flags=re.MULTILINE))
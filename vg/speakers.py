@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from itertools import cycle
 from pathlib import Path
 
+from .jsonio import write_json
 from .project import load_project
 
 
@@ -42,17 +44,18 @@ def assign_speakers(
 
     updated = 0
     total = 0
-    i = 0
+    next_speaker = cycle(speakers)
     for seg in data:
         if not isinstance(seg, dict):
             continue
         total += 1
         if only_missing and "speaker" in seg and seg["speaker"] not in (None, "", 0):
             continue
-        seg["speaker"] = speakers[i % len(speakers)]
-        i += 1
+        seg["speaker"] = next(next_speaker)
         updated += 1
 
-    seg_path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    # 割り当てが無ければ内容は変わらないので書き戻さない
+    if updated:
+        write_json(seg_path, data)
     return SpeakerAssignmentResult(updated=updated, total=total)
 
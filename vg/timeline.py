@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
-from .audio import concat_wavs, read_wav_info
+from .audio import WavInfo, concat_wavs, read_wav_info
+from .jsonio import read_json, write_json
 from .project import load_project
 
 
@@ -30,13 +32,23 @@ def build_timeline(project_dir: Path, concat_wav: bool) -> None:
     t = 0.0
     wavs: list[Path] = []
 
+    # wav のヘッダ情報は (mtime, size) が変わっていなければ前回の値を使う
+    cache_path = project.path(".cache", "wav_info.json")
+    old_cache = _load_wav_info_cache(cache_path)
+    new_cache: dict[str, dict] = {}
+
+    # stat とヘッダ読み込みは1件あたり数十マイクロ秒なので、スレッドに分けるより順に読むほうが速い
+    # （2回目以降は .cache/wav_info.json が効いてヘッダも読まない）
     for seg in segments:
         seg_id = seg["id"]
         title = seg.get("title") or seg_id
         wav_path = project.path("audio", f"{seg_id}.wav")
-        if not wav_path.exists():
-            raise FileNotFoundError(f"wav not found: {wav_path} (run: python -m vg tts {project.root})")
-        info = read_wav_info(wav_path)
+        try:
+            st = wav_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"wav not found: {wav_path} (run: python -m vg tts {project.root})") from None
+        info, entry = _read_wav_info_cached(wav_path, st, key=f"audio/{seg_id}.wav", old=old_cache)
+        new_cache[f"audio/{seg_id}.wav"] = entry
         start = t
         end = t + info.duration_sec
         items.append(
@@ -59,12 +71,54 @@ def build_timeline(project_dir: Path, concat_wav: bool) -> None:
         "items": [item.__dict__ for item in items],
     }
 
+    if new_cache != old_cache:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(cache_path, new_cache)
+        except OSError:
+            pass
+
     project.path("script").mkdir(parents=True, exist_ok=True)
-    project.path("script", "timeline.json").write_text(
-        json.dumps(out, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+    write_json(project.path("script", "timeline.json"), out)
 
     if concat_wav:
         concat_wavs(wavs, project.path("export", "master.wav"))
 
+
+def _load_wav_info_cache(path: Path) -> dict[str, dict]:
+    try:
+        data = read_json(path)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _read_wav_info_cached(
+    wav_path: Path,
+    st: os.stat_result,
+    *,
+    key: str,
+    old: dict[str, dict],
+) -> tuple[WavInfo, dict]:
+    hit = old.get(key)
+    if isinstance(hit, dict) and hit.get("mtime_ns") == st.st_mtime_ns and hit.get("size") == st.st_size:
+        try:
+            info = WavInfo(
+                nchannels=int(hit["nchannels"]),
+                sampwidth=int(hit["sampwidth"]),
+                framerate=int(hit["framerate"]),
+                nframes=int(hit["nframes"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            info = read_wav_info(wav_path)
+    else:
+        info = read_wav_info(wav_path)
+    entry = {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "nchannels": info.nchannels,
+        "sampwidth": info.sampwidth,
+        "framerate": info.framerate,
+        "nframes": info.nframes,
+    }
+    return info, entry
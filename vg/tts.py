@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.error import URLError
 
 from .project import load_project
 from .voicevox import VoiceVoxClient
 
+TTS_WORKERS = 4
+
 
 def synthesize_tts(project_dir: Path, base_url: str | None, speaker: int | None, force: bool) -> None:
     project = load_project(project_dir)
-    resolved_base_url = base_url or project.tts_base_url
-    resolved_speaker = speaker if speaker is not None else project.tts_speaker
+    resolved_base_url, resolved_speaker = resolve_tts_settings(project, base_url=base_url, speaker=speaker)
 
     segments_json = project.path("script", "segments.json")
     if not segments_json.exists():
@@ -23,27 +25,69 @@ def synthesize_tts(project_dir: Path, base_url: str | None, speaker: int | None,
 
     client = VoiceVoxClient(base_url=resolved_base_url)
 
-    for seg in segments:
-        seg_id = seg["id"]
-        seg_speaker = seg.get("speaker")
-        if isinstance(seg_speaker, int):
-            use_speaker = seg_speaker
-        elif isinstance(seg_speaker, str) and seg_speaker.isdigit():
-            use_speaker = int(seg_speaker)
-        else:
-            use_speaker = resolved_speaker
-        txt_path = project.path(seg["text_path"])
-        text = txt_path.read_text(encoding="utf-8").strip()
-        wav_path = out_dir / f"{seg_id}.wav"
-        if wav_path.exists() and not force:
-            continue
+    def synth_one(seg: dict) -> None:
+        synthesize_segment(
+            project,
+            seg,
+            client=client,
+            out_dir=out_dir,
+            default_speaker=resolved_speaker,
+            base_url=resolved_base_url,
+            force=force,
+        )
 
+    # VOICEVOX への HTTP 呼び出しは I/O 待ちなので、数本ずつ並列に投げる（ローカルエンジンを詰まらせない程度に制限）
+    workers = max(1, min(TTS_WORKERS, len(segments)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(synth_one, seg) for seg in segments]
         try:
-            query = client.audio_query(text=text, speaker=use_speaker)
-            wav = client.synthesis(query=query, speaker=use_speaker)
-        except URLError as e:
-            raise RuntimeError(
-                "VOICEVOX(VOICEBOX) に接続できませんでした。"
-                f" base_url={resolved_base_url} を確認し、ローカルAPIが起動している状態で再実行してください。"
-            ) from e
-        wav_path.write_bytes(wav)
+            for f in futures:
+                f.result()
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+
+def resolve_tts_settings(project, *, base_url: str | None, speaker: int | None) -> tuple[str, int]:
+    """Returns (base_url, default speaker): explicit overrides first, then project.json."""
+    resolved_base_url = base_url or project.tts_base_url
+    resolved_speaker = speaker if speaker is not None else project.tts_speaker
+    return resolved_base_url, resolved_speaker
+
+
+def synthesize_segment(
+    project,
+    seg: dict,
+    *,
+    client: VoiceVoxClient,
+    out_dir: Path,
+    default_speaker: int,
+    base_url: str,
+    force: bool,
+) -> bool:
+    """Writes `audio/<id>.wav` for one segment. Returns False when an existing wav was kept."""
+    seg_id = seg["id"]
+    wav_path = out_dir / f"{seg_id}.wav"
+    if wav_path.exists() and not force:
+        return False
+
+    seg_speaker = seg.get("speaker")
+    if isinstance(seg_speaker, int):
+        use_speaker = seg_speaker
+    elif isinstance(seg_speaker, str) and seg_speaker.isdigit():
+        use_speaker = int(seg_speaker)
+    else:
+        use_speaker = default_speaker
+    txt_path = project.path(seg["text_path"])
+    text = txt_path.read_text(encoding="utf-8").strip()
+
+    try:
+        query = client.audio_query(text=text, speaker=use_speaker)
+        client.synthesis_to(query=query, speaker=use_speaker, out_path=wav_path)
+    except URLError as e:
+        raise RuntimeError(
+            "VOICEVOX(VOICEBOX) に接続できませんでした。"
+            f" base_url={base_url} を確認し、ローカルAPIが起動している状態で再実行してください。"
+        ) from e
+    return True
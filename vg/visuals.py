@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-import json
+import os
 import shutil
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from html import unescape
 from html.parser import HTMLParser
+from itertools import accumulate
 from pathlib import Path
 from urllib.parse import urlparse
 
+from .jsonio import read_json_cached, write_json
 from .project import load_project
 
 
@@ -67,17 +72,18 @@ def assign_visuals(project_dir: Path, *, force: bool = False) -> list[VisualAssi
     summary_slide = project.path("assets", "slides", "summary_001.png")
 
     assignments: list[VisualAssignment] = []
+    slide_jobs: list[tuple[Path, str, str]] = []
+    # 元画像 -> 今回最初に書き出したセグメント画像（同じ画像を使う2つ目以降はそこからリンクする）
+    written: dict[Path, Path] = {}
     for seg in segments:
         seg_id = seg["id"]
         title = seg.get("title") or seg_id
-        txt_path = project.path(seg["text_path"])
-        text = txt_path.read_text(encoding="utf-8").strip()
 
         if seg_id == "0015_outro" and summary_slide.exists():
             # Preserve the curated summary slide if present.
             out_path = out_dir / "0015_outro.png"
             if force or not out_path.exists():
-                shutil.copyfile(summary_slide, out_path)
+                _link_or_copy(summary_slide, out_path)
             assignments.append(
                 VisualAssignment(seg_id=seg_id, kind="slide", source_path=summary_slide.relative_to(project.root).as_posix(), out_path=out_path.relative_to(project.root).as_posix())
             )
@@ -86,7 +92,7 @@ def assign_visuals(project_dir: Path, *, force: bool = False) -> list[VisualAssi
         # If we have an assigned image, copy it and delete any previous slide png for that seg_id.
         assigned = mapping.get(seg_id)
         if assigned is not None and assigned.exists():
-            out_path = _copy_as_segment_image(out_dir, seg_id, assigned, force=force)
+            out_path = _copy_as_segment_image(out_dir, seg_id, assigned, force=force, written=written)
             assignments.append(
                 VisualAssignment(
                     seg_id=seg_id,
@@ -105,29 +111,41 @@ def assign_visuals(project_dir: Path, *, force: bool = False) -> list[VisualAssi
             )
             continue
 
-        _render_slide_png(out_path, title=title, text=text)
+        text = project.path(seg["text_path"]).read_text(encoding="utf-8").strip()
+        slide_jobs.append((out_path, title, text))
         assignments.append(
             VisualAssignment(seg_id=seg_id, kind="slide", source_path=None, out_path=out_path.relative_to(project.root).as_posix())
         )
 
-    (out_dir / "assignments.json").write_text(
-        json.dumps(
-            {
-                "items": [
-                    {"id": a.seg_id, "kind": a.kind, "source_path": a.source_path, "out_path": a.out_path}
-                    for a in assignments
-                ]
-            },
-            ensure_ascii=False,
-            indent=2,
-        )
-        + "\n",
-        encoding="utf-8",
+    # スライドは互いに独立で、PNG の圧縮（zlib）は GIL を外して走るので、まとめてスレッドで並列に描く
+    if slide_jobs:
+        workers = max(1, min(os.cpu_count() or 1, len(slide_jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_render_slide_png, out_path, title=title, text=text) for out_path, title, text in slide_jobs]
+            try:
+                for f in futures:
+                    f.result()
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+
+    write_json(
+        out_dir / "assignments.json",
+        {
+            "items": [
+                {"id": a.seg_id, "kind": a.kind, "source_path": a.source_path, "out_path": a.out_path}
+                for a in assignments
+            ]
+        },
     )
 
     return assignments
 
 
+_HTML_CHUNK_CHARS = 1 << 16
+
+
 @dataclass(frozen=True)
 class _Figure:
     image_path: Path | None
@@ -147,65 +165,10 @@ def _extract_figures_with_context(project) -> list[_Figure]:
     url_to_local = _load_downloaded_url_map(project)
     base_url = _extract_source_url_from_article_md(project)
 
-    class P(HTMLParser):
-        def __init__(self) -> None:
-            super().__init__(convert_charrefs=True)
-            self.section_h2 = ""
-            self.section_h3 = ""
-            self.in_fig = False
-            self.in_caption = False
-            self.cur_img: str | None = None
-            self.cur_caption: list[str] = []
-            self.figures: list[tuple[str | None, str, str]] = []
-
-        def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
-            t = tag.lower()
-            a = {k.lower(): (v or "") for k, v in attrs}
-            if t in {"h2", "h3"}:
-                # reset text capture
-                self._heading_tag = t
-                self._heading_buf = []
-            if t == "figure":
-                self.in_fig = True
-                self.cur_img = None
-                self.cur_caption = []
-            if self.in_fig and t == "img":
-                self.cur_img = a.get("src") or a.get("data-src") or self.cur_img
-            if self.in_fig and t == "figcaption":
-                self.in_caption = True
-
-        def handle_endtag(self, tag: str) -> None:
-            t = tag.lower()
-            if t in {"h2", "h3"} and getattr(self, "_heading_tag", None) == t:
-                text = _clean_text("".join(getattr(self, "_heading_buf", [])))
-                if t == "h2":
-                    self.section_h2 = text
-                    self.section_h3 = ""
-                else:
-                    self.section_h3 = text
-                self._heading_tag = None
-                self._heading_buf = []
-
-            if t == "figcaption":
-                self.in_caption = False
-            if t == "figure" and self.in_fig:
-                cap = _clean_text("".join(self.cur_caption))
-                section = self.section_h3 or self.section_h2
-                self.figures.append((self.cur_img, cap, section))
-                self.in_fig = False
-
-        def handle_data(self, data: str) -> None:
-            if getattr(self, "_heading_tag", None) in {"h2", "h3"}:
-                self._heading_buf.append(data)
-            if self.in_caption:
-                self.cur_caption.append(data)
-
-    parser = P()
-    parser.feed(html_path.read_text(encoding="utf-8", errors="replace"))
-    parser.close()
+    raw_figures = _parse_figures(html_path)
 
     out: list[_Figure] = []
-    for raw_url, cap, section in parser.figures:
+    for raw_url, cap, section in raw_figures:
         image_path: Path | None = None
         if raw_url:
             try:
@@ -222,6 +185,105 @@ def _extract_figures_with_context(project) -> list[_Figure]:
     return out
 
 
+def _parse_figures(html_path: Path) -> list[tuple[str | None, str, str]]:
+    """
+    Returns (img url, caption, nearest h3/h2 text) for each <figure> in document order.
+    """
+    try:
+        from selectolax.lexbor import LexborHTMLParser  # type: ignore[import-not-found]
+    except ImportError:
+        # selectolax は任意依存。無ければ標準ライブラリの HTMLParser で処理する。
+        return _parse_figures_stdlib(html_path)
+
+    tree = LexborHTMLParser(html_path.read_text(encoding="utf-8", errors="replace"))
+    section_h2 = ""
+    section_h3 = ""
+    figures: list[tuple[str | None, str, str]] = []
+    # css() は文書順に返すので、見出しとの前後関係は HTMLParser で順に読むのと同じになる
+    for node in tree.css("h2, h3, figure"):
+        if node.tag == "h2":
+            section_h2 = _clean_text(node.text(deep=True))
+            section_h3 = ""
+            continue
+        if node.tag == "h3":
+            section_h3 = _clean_text(node.text(deep=True))
+            continue
+        # 入れ子の figure は内側だけを数える（css() は自分自身も含む）
+        if len(node.css("figure")) > 1:
+            continue
+        img: str | None = None
+        for el in node.css("img"):
+            a = {k.lower(): (v or "") for k, v in el.attributes.items()}
+            img = a.get("src") or a.get("data-src") or img
+        cap = _clean_text("".join(el.text(deep=True) for el in node.css("figcaption")))
+        figures.append((img, cap, section_h3 or section_h2))
+    return figures
+
+
+def _parse_figures_stdlib(html_path: Path) -> list[tuple[str | None, str, str]]:
+    parser = _FigureParser()
+    # ファイル全体を文字列にせず、64K 文字ずつ流し込む（テキストモードなので改行の扱いと UTF-8 の境目は read_text と同じ）
+    with html_path.open(encoding="utf-8", errors="replace") as f:
+        while chunk := f.read(_HTML_CHUNK_CHARS):
+            parser.feed(chunk)
+    parser.close()
+    return parser.figures
+
+
+class _FigureParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.section_h2 = ""
+        self.section_h3 = ""
+        self.in_fig = False
+        self.in_caption = False
+        self.cur_img: str | None = None
+        self.cur_caption: list[str] = []
+        self.figures: list[tuple[str | None, str, str]] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        t = tag.lower()
+        a = {k.lower(): (v or "") for k, v in attrs}
+        if t in {"h2", "h3"}:
+            # reset text capture
+            self._heading_tag = t
+            self._heading_buf = []
+        if t == "figure":
+            self.in_fig = True
+            self.cur_img = None
+            self.cur_caption = []
+        if self.in_fig and t == "img":
+            self.cur_img = a.get("src") or a.get("data-src") or self.cur_img
+        if self.in_fig and t == "figcaption":
+            self.in_caption = True
+
+    def handle_endtag(self, tag: str) -> None:
+        t = tag.lower()
+        if t in {"h2", "h3"} and getattr(self, "_heading_tag", None) == t:
+            text = _clean_text("".join(getattr(self, "_heading_buf", [])))
+            if t == "h2":
+                self.section_h2 = text
+                self.section_h3 = ""
+            else:
+                self.section_h3 = text
+            self._heading_tag = None
+            self._heading_buf = []
+
+        if t == "figcaption":
+            self.in_caption = False
+        if t == "figure" and self.in_fig:
+            cap = _clean_text("".join(self.cur_caption))
+            section = self.section_h3 or self.section_h2
+            self.figures.append((self.cur_img, cap, section))
+            self.in_fig = False
+
+    def handle_data(self, data: str) -> None:
+        if getattr(self, "_heading_tag", None) in {"h2", "h3"}:
+            self._heading_buf.append(data)
+        if self.in_caption:
+            self.cur_caption.append(data)
+
+
 def _load_downloaded_url_map(project) -> dict[str, str]:
     """
     Map URL path -> local project-relative path from assets/images/article/images.json.
@@ -230,7 +292,7 @@ def _load_downloaded_url_map(project) -> dict[str, str]:
     if not idx.exists():
         return {}
     try:
-        data = json.loads(idx.read_text(encoding="utf-8"))
+        data = read_json_cached(idx)
     except Exception:
         return {}
     out: dict[str, str] = {}
@@ -261,6 +323,10 @@ def _extract_source_url_from_article_md(project) -> str | None:
     return None
 
 
+# 見出しとキャプションの照合で無視する空白・記号（1回の translate でまとめて消す）
+_norm_drop = str.maketrans("", "", " 　\n\t・—–-＿_（）():：。.、,!！?？…")
+
+
 def _map_figures_to_segments(figures: list[_Figure], segments: list[dict]) -> dict[str, Path]:
     """
     Choose figure images per segment by matching figure caption/section to segment titles.
@@ -269,27 +335,16 @@ def _map_figures_to_segments(figures: list[_Figure], segments: list[dict]) -> di
 
     # Normalize helper.
     def norm(s: str) -> str:
-        s = unescape(s or "")
-        s = s.lower()
-        for ch in (" ", "　", "\n", "\t", "・", "—", "–", "-", "＿", "_", "（", "）", "(", ")", ":", "：", "。", ".", "、", ",", "!", "！", "?", "？", "…"):
-            s = s.replace(ch, "")
-        return s
-
-    def score(fig: _Figure, seg_id: str) -> int:
-        title = seg_title.get(seg_id) or ""
-        cap = fig.caption or ""
-        sec = fig.section or ""
-        t = norm(title)
-        c = norm(cap)
-        s = norm(sec)
+        return unescape(s or "").lower().translate(_norm_drop)
 
+    def score(title: str, t: str, cap: str, c: str, s: str) -> int:
+        # t/c/s は title/caption/section を norm() 済みのもの
         sc = 0
         if c and t:
             if c in t or t in c:
                 sc = max(sc, 80 + min(len(c), len(t)))
             # token overlap (rough)
-            for token in (cap, sec):
-                tn = norm(token)
+            for tn in (c, s):
                 if tn and tn in t:
                     sc = max(sc, 60 + len(tn))
         if s and t and (s in t or t in s):
@@ -309,19 +364,33 @@ def _map_figures_to_segments(figures: list[_Figure], segments: list[dict]) -> di
     figs = [f for f in figures if f.image_path is not None]
     figs.sort(key=lambda f: (0 if f.caption else 1))
 
-    seg_ids = list(seg_title.keys())
+    # 正規化は文字列ごとに1回だけ行い、(図 × セグメント) の総当たりでは比較だけにする
+    seg_norm = {sid: (title, norm(title)) for sid, title in seg_title.items()}
+    # 見出しの定型ルール（"使い方"）以外は部分一致なので、文字を1つも共有しないセグメントは 0 点と分かる
+    seg_chars = {sid: frozenset(t) for sid, (_title, t) in seg_norm.items()}
+    seg_rule = {sid: "使い方" in title for sid, (title, _t) in seg_norm.items()}
     for fig in figs:
         if fig.image_path is None or fig.image_path in used_images:
             continue
+        cap = fig.caption or ""
+        c = norm(cap)
+        s = norm(fig.section or "")
+        fig_chars = frozenset(c + s)
+        # この図が取り得る最高点。そこに達したら後続のセグメントが上回ることはない（同点なら先勝ち）
+        ceiling = max(80 + len(c) if c else 0, 60 + len(s) if c and s else 0, 50 + len(s) if s else 0, 90)
         best_id = None
         best = 0
-        for sid in seg_ids:
+        for sid, (title, t) in seg_norm.items():
             if sid in mapping:
                 continue
-            sc = score(fig, sid)
+            if not seg_rule[sid] and fig_chars.isdisjoint(seg_chars[sid]):
+                continue
+            sc = score(title, t, cap, c, s)
             if sc > best:
                 best = sc
                 best_id = sid
+                if best >= ceiling:
+                    break
         if best_id is not None and best >= 60:
             mapping[best_id] = fig.image_path
             used_images.add(fig.image_path)
@@ -333,7 +402,7 @@ def _load_segments_index(project) -> list[dict]:
     p = project.path("script", "segments.json")
     if not p.exists():
         raise FileNotFoundError(f"segments.json not found: {p}")
-    data = json.loads(p.read_text(encoding="utf-8"))
+    data = read_json_cached(p)
     if not isinstance(data, list):
         raise ValueError("segments.json must be a list")
     return data
@@ -344,7 +413,7 @@ def _load_article_images(project) -> list[Path]:
     idx = project.path("assets", "images", "article", "images.json")
     if idx.exists():
         try:
-            data = json.loads(idx.read_text(encoding="utf-8"))
+            data = read_json_cached(idx)
             items = data.get("items") or []
             out: list[Path] = []
             for it in items:
@@ -389,10 +458,10 @@ def _pick_screenshots(images: list[Path]) -> list[Path]:
     return out
 
 
-def _copy_as_segment_image(out_dir: Path, seg_id: str, src: Path, *, force: bool) -> Path:
+def _copy_as_segment_image(out_dir: Path, seg_id: str, src: Path, *, force: bool, written: dict[Path, Path]) -> Path:
     # Remove any prior png slide if we're switching to an image.
     slide_png = out_dir / f"{seg_id}.png"
-    if slide_png.exists() and slide_png.resolve() != src.resolve():
+    if slide_png.exists() and not os.path.samefile(slide_png, src):
         slide_png.unlink()
 
     ext = src.suffix.lower()
@@ -401,42 +470,97 @@ def _copy_as_segment_image(out_dir: Path, seg_id: str, src: Path, *, force: bool
         out_path = out_dir / f"{seg_id}.png"
         if out_path.exists() and not force:
             return out_path
+        first = written.get(src)
+        if first is not None:
+            # 同じ元画像の変換結果がもうあるので、デコードと PNG 圧縮をやり直さずにリンクする
+            _link_or_copy(first, out_path)
+            return out_path
         from PIL import Image
 
-        im = Image.open(src).convert("RGB")
-        im.save(out_path)
+        with Image.open(src) as im:
+            rgb = im if im.mode == "RGB" else im.convert("RGB")
+            out_path.unlink(missing_ok=True)
+            rgb.save(out_path)
+        written[src] = out_path
         return out_path
 
     out_path = out_dir / f"{seg_id}{ext}"
     if out_path.exists() and not force:
         return out_path
-    shutil.copyfile(src, out_path)
+    # 2つ目以降は同じディレクトリに書き出した1つ目からリンクする（元画像が別デバイスでもコピーは1回で済む）
+    _link_or_copy(written.get(src, src), out_path)
+    written.setdefault(src, out_path)
     return out_path
 
 
+def _link_or_copy(src: Path, dst: Path) -> None:
+    # 同じファイルシステムならハードリンクにしてデータのコピーを省く（できなければ通常のコピー）
+    if dst.exists():
+        if os.path.samefile(src, dst):
+            return
+        # 上書きで書き込むと、リンクを共有している元画像まで書き換わるので、先に消してから作る
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+# Light green theme, text-only slide.
+_SLIDE_W, _SLIDE_H = 1920, 1080
+_SLIDE_BG = (224, 244, 232)  # pale mint
+_SLIDE_FG = (16, 34, 24)
+_SLIDE_MUTED = (70, 94, 82)
+_SLIDE_ACCENT = (38, 140, 90)
+_SLIDE_MARGIN_X = 140
+_SLIDE_MARGIN_TOP = 120
+_SLIDE_BAR_Y = _SLIDE_MARGIN_TOP + 110
+
+# 日本語の出るフォントを順に探す（先頭が従来の macOS 用。どれも無ければ先頭のまま truetype に渡してエラーにする）
+_SLIDE_FONT_PATH = "/System/Library/Fonts/Supplemental/Arial Unicode.ttf"
+
+
+@lru_cache(maxsize=32)
+def _font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    # フォントファイルの読み込みと FreeType の初期化はスライドごとにやり直さない
+    from PIL import ImageFont
+
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=1)
+def _slide_base() -> Image.Image:
+    # 背景色とアクセントバーはどのスライドでも同じなので、1枚だけ描いておいて copy() して使う
+    # （バーはタイトル文字の下端より下にあり、描く順番を入れ替えても重ならない）
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (_SLIDE_W, _SLIDE_H), _SLIDE_BG)
+    d = ImageDraw.Draw(img)
+    d.rounded_rectangle(
+        (_SLIDE_MARGIN_X, _SLIDE_BAR_Y, _SLIDE_MARGIN_X + 320, _SLIDE_BAR_Y + 10), radius=6, fill=_SLIDE_ACCENT
+    )
+    return img
+
+
 def _render_slide_png(out_path: Path, *, title: str, text: str) -> None:
-    from PIL import Image, ImageDraw, ImageFont
+    from PIL import ImageDraw
 
-    # Light green theme, text-only slide.
-    W, H = 1920, 1080
-    bg = (224, 244, 232)  # pale mint
-    fg = (16, 34, 24)
-    muted = (70, 94, 82)
-    accent = (38, 140, 90)
+    W, H = _SLIDE_W, _SLIDE_H
+    fg = _SLIDE_FG
+    muted = _SLIDE_MUTED
 
-    img = Image.new("RGB", (W, H), bg)
+    img = _slide_base().copy()
     d = ImageDraw.Draw(img)
 
-    font_path = "/System/Library/Fonts/Supplemental/Arial Unicode.ttf"
-    title_font = ImageFont.truetype(font_path, 84)
-    body_font = ImageFont.truetype(font_path, 52)
+    font_path = _SLIDE_FONT_PATH
+    title_font = _font(font_path, 84)
+    body_font = _font(font_path, 52)
 
-    margin_x = 140
-    margin_top = 120
+    margin_x = _SLIDE_MARGIN_X
+    margin_top = _SLIDE_MARGIN_TOP
 
     d.text((margin_x, margin_top), title, font=title_font, fill=fg)
-    bar_y = margin_top + 110
-    d.rounded_rectangle((margin_x, bar_y, margin_x + 320, bar_y + 10), radius=6, fill=accent)
+    bar_y = _SLIDE_BAR_Y
 
     excerpt = " ".join(text.strip().split())
     if len(excerpt) > 220:
@@ -451,7 +575,10 @@ def _render_slide_png(out_path: Path, *, title: str, text: str) -> None:
         y += 64
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(out_path)
+    # 以前は記事画像へのハードリンクだったかもしれないので、上書きせず作り直す
+    out_path.unlink(missing_ok=True)
+    # 平坦な色面と文字だけの画像で、すぐ動画のエンコードに使うだけなので、圧縮は最速の設定にする
+    img.save(out_path, format="PNG", compress_level=1, optimize=False)
 
 
 def _wrap_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont, *, max_width: int) -> list[str]:
@@ -483,24 +610,38 @@ def _wrap_chars(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFo
     text = text.strip()
     if not text:
         return []
+    # 各行の終わりは、1文字ずつの送り幅の累積和から二分探索で見当をつけ、その前後だけを
+    # 行全体の bbox（カーニング込み）で測って確定する（1文字足すたびに行全体を測り直さない）
+    cum = list(accumulate([_char_advance(font, ch) for ch in text], initial=0.0))
+    n = len(text)
+
+    def fits(start: int, end: int) -> bool:
+        return draw.textbbox((0, 0), text[start:end], font=font)[2] <= max_width
+
     lines: list[str] = []
-    cur = ""
-    for ch in text:
-        trial = cur + ch
-        bbox = draw.textbbox((0, 0), trial, font=font)
-        if bbox[2] <= max_width or not cur:
-            cur = trial
-            continue
-        lines.append(cur)
-        cur = ch
-    if cur:
-        lines.append(cur)
+    start = 0
+    while start < n:
+        end = max(start + 1, bisect_right(cum, cum[start] + max_width, start + 1) - 1)
+        if fits(start, end):
+            while end < n and fits(start, end + 1):
+                end += 1
+        else:
+            # 1文字でも幅を超えるときはその文字だけで1行にする
+            while end > start + 1 and not fits(start, end):
+                end -= 1
+        lines.append(text[start:end])
+        start = end
     return lines
 
 
+@lru_cache(maxsize=4096)
+def _char_advance(font: ImageFont.FreeTypeFont, ch: str) -> float:
+    return font.getlength(ch)
+
+
 def _clean_text(s: str) -> str:
-    s = unescape(s or "")
-    return " ".join(s.split()).strip()
+    # str.split() は空白の連続をまとめて前後も落とすので、正規表現より速く strip も要らない
+    return " ".join(unescape(s or "").split())
 
 
 def _require_pillow() -> None:
@@ -1,28 +1,128 @@
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+import gzip
+import http.client
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urlsplit
+
+from .jsonio import dumps_compact, loads
+
+# 使い回している接続がサーバ側で閉じられていたときに出る例外（新しい接続で1回だけ送り直す）
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+_STREAM_CHUNK = 1 << 20
 
 
 @dataclass(frozen=True)
 class VoiceVoxClient:
     base_url: str
+    # HTTP/1.1 keep-alive の接続をスレッドごとに1本持つ（http.client の接続はスレッド間で共有できない）
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False, compare=False)
 
     def audio_query(self, text: str, speaker: int) -> dict:
         qs = urlencode({"text": text, "speaker": str(speaker)})
-        url = f"{self.base_url.rstrip('/')}/audio_query?{qs}"
-        req = Request(url, method="POST")
-        with urlopen(req) as resp:
-            data = resp.read().decode("utf-8")
-        return json.loads(data)
+        data = self._post(f"/audio_query?{qs}", headers={"Accept-Encoding": "gzip"})
+        return loads(data)
 
     def synthesis(self, query: dict, speaker: int) -> bytes:
         qs = urlencode({"speaker": str(speaker)})
-        url = f"{self.base_url.rstrip('/')}/synthesis?{qs}"
-        body = json.dumps(query, ensure_ascii=False).encode("utf-8")
-        req = Request(url, data=body, method="POST", headers={"Content-Type": "application/json"})
-        with urlopen(req) as resp:
-            return resp.read()
+        body = dumps_compact(query)
+        return self._post(f"/synthesis?{qs}", body=body, headers={"Content-Type": "application/json"})
+
+    def synthesis_to(self, query: dict, speaker: int, out_path: Path) -> None:
+        """
+        Like `synthesis`, but streams the WAV straight into `out_path` instead of holding it in memory.
+        The file is written under a temporary name and renamed, so an interrupted download never
+        leaves a truncated wav behind.
+        """
+        qs = urlencode({"speaker": str(speaker)})
+        body = dumps_compact(query)
+        resp = self._open(
+            f"/synthesis?{qs}",
+            body=body,
+            headers={"Content-Type": "application/json", "Accept-Encoding": "identity"},
+        )
+        tmp_path = out_path.with_name(out_path.name + ".part")
+        try:
+            src = gzip.GzipFile(fileobj=resp) if _is_gzip(resp) else resp
+            with tmp_path.open("wb") as f:
+                shutil.copyfileobj(src, f, _STREAM_CHUNK)
+        except BaseException:
+            # 途中までしか読んでいない接続は次のリクエストに使えない
+            self._drop_connection()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._release(resp)
+        os.replace(tmp_path, out_path)
+
+    def _post(self, path: str, *, body: bytes | None = None, headers: dict[str, str]) -> bytes:
+        resp = self._open(path, body=body, headers=headers)
+        try:
+            data = resp.read()
+        except BaseException:
+            self._drop_connection()
+            raise
+        self._release(resp)
+        if _is_gzip(resp):
+            data = gzip.decompress(data)
+        return data
+
+    def _open(self, path: str, *, body: bytes | None, headers: dict[str, str]) -> http.client.HTTPResponse:
+        # レスポンスのヘッダまで受け取って返す（本文は呼び出し側が読み切ってから _release する）
+        parts = urlsplit(self.base_url.rstrip("/"))
+        url = f"{self.base_url.rstrip('/')}{path}"
+        target = f"{parts.path}{path}"
+        retried = False
+        while True:
+            conn, reused = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request("POST", target, body=body, headers=headers)
+                resp = conn.getresponse()
+            except _STALE_CONNECTION_ERRORS as e:
+                self._drop_connection()
+                if reused and not retried:
+                    retried = True
+                    continue
+                raise URLError(e) from e
+            except (OSError, http.client.HTTPException) as e:
+                # urlopen と同じく、接続系の失敗は URLError として呼び出し側へ返す
+                self._drop_connection()
+                raise URLError(e) from e
+
+            if resp.status >= 400:
+                try:
+                    resp.read()
+                finally:
+                    self._release(resp)
+                raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+            return resp
+
+    def _release(self, resp: http.client.HTTPResponse) -> None:
+        if resp.will_close:
+            self._drop_connection()
+
+    def _connection(self, scheme: str, netloc: str) -> tuple[http.client.HTTPConnection, bool]:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn, True
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc)
+        else:
+            conn = http.client.HTTPConnection(netloc)
+        self._local.conn = conn
+        return conn, False
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
 
+def _is_gzip(resp: http.client.HTTPResponse) -> bool:
+    return (resp.getheader("Content-Encoding") or "").lower() == "gzip"